@@ -4,18 +4,23 @@
   将同一张 PNG/JPEG 封面递归写入 MP3、M4A 或 WMA 文件。
 
 配置文件：
-  默认读取 config.yaml；输入目录和封面路径位于 flows.apply_cover。
+  默认读取 config.yaml；输入目录、封面路径和封面压缩参数（cover_max_pixels、cover_max_kb、
+  cover_quality）位于 flows.apply_cover。
 
 可选参数：
   --config-file  配置文件路径，默认 config.yaml。
   --input        临时覆盖输入目录。
   --cover        临时覆盖封面图片路径。
+  --cover-max-pixels  封面最长边上限（像素），超出时缩放并压缩为 JPEG；0 表示保持原图。
+  --cover-max-kb      封面大小上限（KB），超出时逐步降低 JPEG 质量和尺寸；0 表示不限制。
   --max-files    限制本次扫描文件数。
   --write        实际写入文件；未提供时仅预览。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
 
 示例：
   python apply_cover.py --cover assets/cover_images/sample.png --max-files 5
   python apply_cover.py --cover assets/cover_images/sample.png --write
+  python apply_cover.py --cover assets/cover_images/sample.png --cover-max-pixels 1000 --cover-max-kb 300 --write
 
 输出：
   控制台输出 JSON 汇总；--write 会原地更新音频封面。
@@ -39,12 +44,24 @@ def main() -> int:
     parser.add_argument("--config-file", default="config.yaml")
     parser.add_argument("--input")
     parser.add_argument("--cover")
+    parser.add_argument("--cover-max-pixels", type=int)
+    parser.add_argument("--cover-max-kb", type=int)
     parser.add_argument("--max-files", type=int)
     parser.add_argument("--write", action="store_true")
+    parser.add_argument("--full-rescan", action="store_true")
     args = parser.parse_args()
     context = bootstrap_context(__file__, args.config_file)
     return print_result(
-        run(context, input_path=args.input, cover_image=args.cover, write=args.write, max_files=args.max_files)
+        run(
+            context,
+            input_path=args.input,
+            cover_image=args.cover,
+            cover_max_pixels=args.cover_max_pixels,
+            cover_max_kb=args.cover_max_kb,
+            write=args.write,
+            max_files=args.max_files,
+            full_rescan=args.full_rescan,
+        )
     )
 
 
@@ -11,12 +11,18 @@
   --input        临时覆盖输入目录。
   --output       临时覆盖输出目录。
   --max-files    限制本次处理文件数，0 表示不限制。
+  --workers      同时运行的 FFmpeg 转换数，0 表示使用全部 CPU 核。
+  --schedule     path 按路径顺序转换；longest_first 按时长从长到短启动，缩短并行总耗时。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
 
 示例：
   python convert_audio.py --max-files 1
+  python convert_audio.py --workers 8
+  python convert_audio.py --workers 8 --schedule longest_first
 
 输出：
-  转换文件写入 config.yaml 指定的 output/converted，并在控制台输出 JSON 汇总。
+  转换文件写入 config.yaml 指定的 output/converted；终端中在 stderr 实时显示文件内进度和编码速度，
+  结束后在 stdout 输出 JSON 汇总。
 """
 
 from __future__ import annotations
@@ -28,8 +34,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
 
 from mp3_processor.bootstrap import bootstrap_context
-from mp3_processor.cli import print_result
+from mp3_processor.cli import print_progress, print_result
 from mp3_processor.flows.convert_audio_flow import run
+from mp3_processor.modules.scheduling import SCHEDULES
 
 
 def main() -> int:
@@ -38,9 +45,23 @@ def main() -> int:
     parser.add_argument("--input")
     parser.add_argument("--output")
     parser.add_argument("--max-files", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--schedule", choices=SCHEDULES)
+    parser.add_argument("--full-rescan", action="store_true")
     args = parser.parse_args()
     context = bootstrap_context(__file__, args.config_file)
-    return print_result(run(context, input_path=args.input, output_dir=args.output, max_files=args.max_files))
+    return print_result(
+        run(
+            context,
+            input_path=args.input,
+            output_dir=args.output,
+            max_files=args.max_files,
+            progress=print_progress,
+            full_rescan=args.full_rescan,
+            workers=args.workers,
+            schedule=args.schedule,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -11,9 +11,12 @@
   --input        临时覆盖输入图片目录。
   --output       临时覆盖输出目录。
   --max-files    限制本次处理图片数。
+  --workers      同时裁剪的进程数，0 表示使用全部 CPU 核，1 表示在当前进程中顺序处理。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
 
 示例：
   python prepare_cover.py --max-files 1
+  python prepare_cover.py --workers 4
 
 输出：
   裁剪图片写入 output/covers，并在控制台输出 JSON 汇总。
@@ -38,9 +41,20 @@ def main() -> int:
     parser.add_argument("--input")
     parser.add_argument("--output")
     parser.add_argument("--max-files", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--full-rescan", action="store_true")
     args = parser.parse_args()
     context = bootstrap_context(__file__, args.config_file)
-    return print_result(run(context, input_path=args.input, output_dir=args.output, max_files=args.max_files))
+    return print_result(
+        run(
+            context,
+            input_path=args.input,
+            output_dir=args.output,
+            max_files=args.max_files,
+            workers=args.workers,
+            full_rescan=args.full_rescan,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -11,12 +11,22 @@
   --input        临时覆盖输入目录。
   --output       临时覆盖输出目录。
   --max-files    限制本次处理文件数。
+  --mode         切分引擎：decode 整段解码到内存；stream 由 FFmpeg 逐段定位，内存占用恒定；
+                 copy 对 MP3 源无损复制帧，其他格式按 stream 转码；
+                 markers 按同名 .cue 或内嵌章节无损切分，保持源格式并以章节标题命名。
+  --workers      单个文件内同时编码的分段数，0 表示使用全部 CPU 核。
+  --silence-window  切分点前后搜索静音的秒数，0 表示严格按时长切分。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
 
 示例：
   python split_audio.py --max-files 1
+  python split_audio.py --mode stream
+  python split_audio.py --mode stream --workers 0
+  python split_audio.py --mode stream --silence-window 10
+  python split_audio.py --mode markers
 
 输出：
-  分段文件写入 output/split，并在控制台输出 JSON 汇总。
+  分段文件写入 output/split；终端中在 stderr 实时显示文件内进度和编码速度，结束后在 stdout 输出 JSON 汇总。
 """
 
 from __future__ import annotations
@@ -28,8 +38,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
 
 from mp3_processor.bootstrap import bootstrap_context
-from mp3_processor.cli import print_result
+from mp3_processor.cli import print_progress, print_result
 from mp3_processor.flows.split_audio_flow import run
+from mp3_processor.modules.audio_splitter import SPLIT_MODES
 
 
 def main() -> int:
@@ -38,9 +49,25 @@ def main() -> int:
     parser.add_argument("--input")
     parser.add_argument("--output")
     parser.add_argument("--max-files", type=int)
+    parser.add_argument("--mode", choices=SPLIT_MODES)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--silence-window", type=float)
+    parser.add_argument("--full-rescan", action="store_true")
     args = parser.parse_args()
     context = bootstrap_context(__file__, args.config_file)
-    return print_result(run(context, input_path=args.input, output_dir=args.output, max_files=args.max_files))
+    return print_result(
+        run(
+            context,
+            input_path=args.input,
+            output_dir=args.output,
+            max_files=args.max_files,
+            progress=print_progress,
+            full_rescan=args.full_rescan,
+            mode=args.mode,
+            workers=args.workers,
+            silence_window_seconds=args.silence_window,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -3,10 +3,21 @@
 from __future__ import annotations
 
 import json
+import sys
 
+from mp3_processor.execution import ProgressEvent
 from mp3_processor.results import FlowResult
 
 
 def print_result(result: FlowResult) -> int:
     print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2))
     return 0 if result.ok else 1
+
+
+def print_progress(event: ProgressEvent) -> None:
+    """在交互式终端的 stderr 上原地刷新进度行，不影响 stdout 的 JSON 汇总。"""
+    if not sys.stderr.isatty() or event.stage == "scanning":
+        return
+    line = f"[{event.percent:5.1f}%] {event.message}"
+    sys.stderr.write(f"\r{line:<78}" + ("\n" if event.stage == "completed" else ""))
+    sys.stderr.flush()
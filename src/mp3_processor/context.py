@@ -24,3 +24,23 @@ class AppContext:
     def resolve_path(self, value: str | Path) -> Path:
         path = Path(value).expanduser()
         return path if path.is_absolute() else self.project_root / path
+
+    @property
+    def cache_dir(self) -> Path:
+        """扫描索引、处理账本等运行缓存所在目录。"""
+        return self.resolve_path(self.config.get("app", {}).get("cache_dir") or "output/.cache")
+
+    def scan_index_path(self) -> Path | None:
+        """返回启用时的增量扫描索引位置。"""
+        if not self.config.get("app", {}).get("scan_index", False):
+            return None
+        return self.cache_dir / "scan_index.sqlite3"
+
+    def media_probe_path(self) -> Path | None:
+        """启用 app.probe_cache 时返回媒体信息缓存路径。"""
+        if not self.config.get("app", {}).get("probe_cache", False):
+            return None
+        return self.cache_dir / "media_probe.sqlite3"
+
+    def ledger_path(self) -> Path:
+        return self.cache_dir / "ledger.sqlite3"
@@ -1,12 +1,14 @@
-"""工作流进度通知与协作式取消。"""
+"""工作流进度通知、协作式取消与有界并发执行。"""
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import os
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Event
-from typing import Literal
+from typing import Generic, Literal, TypeVar
 
 
 ProgressStage = Literal["scanning", "running", "completed"]
@@ -14,16 +16,26 @@ ProgressStage = Literal["scanning", "running", "completed"]
 
 @dataclass(frozen=True)
 class ProgressEvent:
-    """从工作流发送给 CLI、GUI 或测试的结构化进度事件。"""
+    """从工作流发送给 CLI、GUI 或测试的结构化进度事件。
+
+    current 为已完成条目数；fraction 为正在处理的条目内部完成比例之和（并行时可大于 1），用于长文件。
+    """
 
     stage: ProgressStage
     message: str
     current: int = 0
     total: int = 0
     item: Path | None = None
+    fraction: float = 0.0
+
+    @property
+    def percent(self) -> float:
+        return min(100.0, (self.current + self.fraction) * 100 / self.total) if self.total else 0.0
 
 
 ProgressCallback = Callable[[ProgressEvent], None]
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class TaskCancelled(RuntimeError):
@@ -56,13 +68,90 @@ def report_progress(
     current: int = 0,
     total: int = 0,
     item: Path | None = None,
+    fraction: float = 0.0,
 ) -> None:
     """在调用方提供监听器时发布进度。"""
     if callback is not None:
-        callback(ProgressEvent(stage, message, current, total, item))
+        callback(ProgressEvent(stage, message, current, total, item, fraction))
 
 
 def check_cancelled(token: CancellationToken | None) -> None:
     """在工作流的安全边界检查取消请求。"""
     if token is not None:
         token.raise_if_cancelled()
+
+
+@dataclass(frozen=True)
+class TaskOutcome(Generic[T, R]):
+    """并发执行中单个任务的结果；error 非空表示该任务失败。"""
+
+    item: T
+    value: R | None = None
+    error: Exception | None = None
+
+
+def resolve_workers(value: int) -> int:
+    """解析并行任务数；0 表示使用全部 CPU 核。"""
+    if value < 0:
+        raise ValueError("workers 不能小于 0")
+    return value or os.cpu_count() or 1
+
+
+def run_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int = 1,
+    cancel_token: CancellationToken | None = None,
+    on_start: Callable[[T], None] | None = None,
+    use_processes: bool = False,
+) -> Generator[TaskOutcome[T, R], None, None]:
+    """最多同时运行 workers 个任务，并按完成顺序产出结果。
+
+    workers 为 1 时在调用线程中顺序执行。取消后不再提交新任务，等待已启动的任务结束后抛出
+    TaskCancelled；任务自身抛出的 TaskCancelled 会直接向上传播。on_start 总在调用线程中执行。
+    """
+    if workers <= 1:
+        for item in items:
+            check_cancelled(cancel_token)
+            if on_start is not None:
+                on_start(item)
+            try:
+                outcome: TaskOutcome[T, R] = TaskOutcome(item, func(item))
+            except TaskCancelled:
+                raise
+            except Exception as exc:
+                outcome = TaskOutcome(item, error=exc)
+            yield outcome
+        return
+
+    executor: Executor = ProcessPoolExecutor(workers) if use_processes else ThreadPoolExecutor(workers)
+    pending: dict[Future[R], T] = {}
+    remaining = iter(items)
+    try:
+        while True:
+            while len(pending) < workers and not (cancel_token is not None and cancel_token.cancelled):
+                try:
+                    item = next(remaining)
+                except StopIteration:
+                    break
+                if on_start is not None:
+                    on_start(item)
+                pending[executor.submit(func, item)] = item
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                if isinstance(error, TaskCancelled):
+                    raise error
+                if error is None:
+                    yield TaskOutcome(item, future.result())
+                elif isinstance(error, Exception):
+                    yield TaskOutcome(item, error=error)
+                else:
+                    raise error
+        check_cancelled(cancel_token)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
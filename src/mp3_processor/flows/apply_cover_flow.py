@@ -7,8 +7,9 @@ from pathlib import Path
 from logging_config import get_logger
 from mp3_processor.context import AppContext
 from mp3_processor.execution import CancellationToken, ProgressCallback, check_cancelled, report_progress
-from mp3_processor.modules.cover_editor import embed_cover
+from mp3_processor.modules.cover_editor import embed_cover, load_configured_cover
 from mp3_processor.modules.files import iter_files
+from mp3_processor.modules.padding import PaddingPolicy
 from mp3_processor.results import FlowResult
 
 
@@ -22,44 +23,73 @@ def run(
     cover_image: str | Path | None = None,
     recursive: bool | None = None,
     replace_existing: bool | None = None,
+    cover_max_pixels: int | None = None,
+    cover_max_kb: int | None = None,
     write: bool = False,
     max_files: int | None = None,
+    full_rescan: bool = False,
     progress: ProgressCallback | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> FlowResult:
-    """向 MP3/M4A/WMA 写入统一封面；默认预览。"""
+    """向 MP3/M4A/WMA 写入统一封面；默认预览。
+
+    写入时封面图片在运行开始时读取一次并构建为 CoverPayload，所有文件共享同一份图片字节和封面帧。
+    cover_max_pixels 或 cover_max_kb 大于 0 时，先把封面缩放并按 cover_quality 压缩为 JPEG。
+    已嵌入相同封面（按 SHA-256 比较图片字节）的文件只读取不保存，计入 unchanged。
+    标签区首次扩大时预留 padding_kb 空白，原地写入与整文件重写的次数记录在 result.stats。
+    """
     config = context.flow_config("apply_cover")
     source_root = context.resolve_path(input_path or config.get("input_path", context.config["app"]["input_path"]))
     cover = context.resolve_path(cover_image or config.get("cover_image", ""))
     if not cover.is_file():
         raise FileNotFoundError(f"封面图片不存在: {cover}")
+    # 只有实际写入时才读取和压缩封面，预览不处理图片。
+    payload = load_configured_cover(cover, config, cover_max_pixels=cover_max_pixels, cover_max_kb=cover_max_kb) if write else None
+    if payload is not None and len(payload.data) != payload.source_size:
+        logger.info("封面已优化: %s | %.1f KB -> %.1f KB", cover, payload.source_size / 1024, len(payload.data) / 1024)
     use_recursive = bool(config.get("recursive", True)) if recursive is None else recursive
     use_replace = bool(config.get("replace_existing", True)) if replace_existing is None else replace_existing
     report_progress(progress, "scanning", f"正在扫描: {source_root}")
-    files = list(iter_files(source_root, ["mp3", "m4a", "wma"], recursive=use_recursive))
+    files = list(
+        iter_files(
+            source_root,
+            ["mp3", "m4a", "wma"],
+            recursive=use_recursive,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
+        )
+    )
     limit = max_files if max_files is not None else int(config.get("max_files", 0))
     if limit > 0:
         files = files[:limit]
     result = FlowResult(discovered=len(files))
+    padding = PaddingPolicy(int(config.get("padding_kb", 256)) * 1024)
     total = len(files)
     report_progress(progress, "running", f"发现 {total} 个待处理文件", total=total)
     for index, source in enumerate(files, start=1):
         check_cancelled(cancel_token)
         report_progress(progress, "running", f"正在写入封面: {source.name}", current=index - 1, total=total, item=source)
-        if not write:
+        if payload is None:
             logger.info("预览封面写入: %s <- %s", source, cover)
             result.skipped += 1
             report_progress(progress, "running", f"已预览: {source.name}", current=index, total=total, item=source)
             continue
         try:
-            embed_cover(source, cover, replace=use_replace)
-            logger.info("封面写入完成: %s", source)
-            result.succeeded += 1
-            result.outputs.append(source)
+            if embed_cover(source, payload, replace=use_replace, padding=padding):
+                logger.info("封面写入完成: %s", source)
+                result.succeeded += 1
+                result.outputs.append(source)
+            else:
+                logger.info("已嵌入相同封面，跳过写入: %s", source)
+                result.unchanged += 1
         except Exception as exc:
             logger.exception("封面写入失败: %s", source)
             result.failed += 1
             result.errors.append(str(exc))
         report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+    result.stats.update(padding.stats())
+    if write:
+        logger.info("封面写入：原地 %d 个，整文件重写 %d 个", padding.in_place, padding.rewrites)
     report_progress(progress, "completed", "封面嵌入任务完成", current=total, total=total)
     return result
+
@@ -2,19 +2,70 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from threading import Lock
 
 from logging_config import get_logger
 from mp3_processor.context import AppContext
-from mp3_processor.execution import CancellationToken, ProgressCallback, check_cancelled, report_progress
-from mp3_processor.modules.audio_converter import convert_to_mp3, validate_audio
-from mp3_processor.modules.files import iter_files, output_path_for
+from mp3_processor.execution import (
+    CancellationToken,
+    ProgressCallback,
+    check_cancelled,
+    report_progress,
+    resolve_workers,
+    run_concurrently,
+)
+from mp3_processor.modules.audio_converter import (
+    EncodeProgress,
+    convert_to_mp3,
+    verify_mp3,
+    watchdog_timeout,
+)
+from mp3_processor.modules.files import iter_files, output_path_for, sweep_temp_files
+from mp3_processor.modules.ledger import ProcessingLedger
+from mp3_processor.modules.media_probe import probe_many
+from mp3_processor.modules.scheduling import SCHEDULES, estimate_seconds, plan_longest_first
 from mp3_processor.results import FlowResult
 
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class _ConvertJob:
+    index: int
+    source: Path
+    destination: Path
+    overwrite: bool
+
+
+class _InFlightProgress:
+    """汇总已完成任务数与进行中任务的完成比例；两者在同一把锁内读取，并行时整体进度仍单调增长。"""
+
+    def __init__(self, completed: int = 0) -> None:
+        self._completed = completed
+        self._fractions: dict[int, float] = {}
+        self._lock = Lock()
+
+    def start(self) -> tuple[int, float]:
+        with self._lock:
+            return self._completed, sum(self._fractions.values())
+
+    def update(self, index: int, fraction: float) -> tuple[int, float]:
+        with self._lock:
+            self._fractions[index] = fraction
+            return self._completed, sum(self._fractions.values())
+
+    def finish(self, index: int) -> tuple[int, float]:
+        with self._lock:
+            self._fractions.pop(index, None)
+            self._completed += 1
+            return self._completed, sum(self._fractions.values())
+
+
 def run(
     context: AppContext,
     *,
@@ -28,10 +79,18 @@ def run(
     overwrite: bool | None = None,
     validate_output: bool | None = None,
     max_files: int | None = None,
+    workers: int | None = None,
+    schedule: str | None = None,
+    use_ledger: bool | None = None,
+    timeout_base_seconds: float | None = None,
+    full_rescan: bool = False,
     progress: ProgressCallback | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> FlowResult:
-    """发现源文件、转换为 MP3 并验证输出。"""
+    """发现源文件、转换为 MP3 并验证输出；workers 控制同时运行的 FFmpeg 数量。
+
+    schedule="longest_first" 时先启动最长的文件；use_ledger 时跳过指纹和参数都未变化的输出。
+    """
     config = context.flow_config("convert_audio")
     source_root = context.resolve_path(input_path or config.get("input_path", context.config["app"]["input_path"]))
     target_root = context.resolve_path(output_dir or config.get("output_dir", "output/converted"))
@@ -45,6 +104,8 @@ def run(
             extensions,
             recursive=use_recursive,
             max_depth=depth,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
         )
     )
     limit = max_files if max_files is not None else int(config.get("max_files", 0))
@@ -52,38 +113,150 @@ def run(
         files = files[:limit]
 
     result = FlowResult(discovered=len(files))
+    for orphan in sweep_temp_files(target_root):
+        logger.info("删除中断遗留的临时文件: %s", orphan)
     ffmpeg = ffmpeg_executable or str(config.get("ffmpeg", context.config.get("app", {}).get("ffmpeg", "ffmpeg")))
     use_overwrite = bool(config.get("overwrite", False)) if overwrite is None else overwrite
     use_validation = bool(config.get("validate_output", True)) if validate_output is None else validate_output
     target_bitrate = bitrate or str(config.get("bitrate", "192k"))
+    worker_count = resolve_workers(int(config.get("workers", 1)) if workers is None else workers)
+    schedule_name = schedule or str(config.get("schedule", "path"))
+    if schedule_name not in SCHEDULES:
+        raise ValueError(f"不支持的调度方式: {schedule_name}")
+    ledger_enabled = bool(config.get("ledger", False)) if use_ledger is None else use_ledger
+    timeout_base = float(config.get("timeout_base_seconds", 0)) if timeout_base_seconds is None else timeout_base_seconds
+    timeout_factor = float(config.get("timeout_factor", 0.1))
+    ledger = ProcessingLedger(context.ledger_path(), hash_sources=bool(config.get("ledger_hash", False))) if ledger_enabled else None
+    params: dict[str, object] = {"codec": "libmp3lame", "bitrate": target_bitrate}
     total = len(files)
     report_progress(progress, "running", f"发现 {total} 个待处理文件", total=total)
-    for index, source in enumerate(files, start=1):
-        check_cancelled(cancel_token)
-        report_progress(progress, "running", f"正在转换: {source.name}", current=index - 1, total=total, item=source)
-        destination = output_path_for(source, source_root, target_root, ".mp3")
-        if destination.exists() and not use_overwrite:
-            logger.info("跳过已存在文件: %s", destination)
-            result.skipped += 1
-            report_progress(progress, "running", f"已跳过: {source.name}", current=index, total=total, item=source)
-            continue
-        try:
-            convert_to_mp3(
-                source,
-                destination,
-                bitrate=target_bitrate,
-                overwrite=use_overwrite,
-                ffmpeg_executable=ffmpeg,
+    completed = 0
+    try:
+        jobs: list[_ConvertJob] = []
+        for index, source in enumerate(files):
+            check_cancelled(cancel_token)
+            destination = output_path_for(source, source_root, target_root, ".mp3")
+            if destination.exists() and not use_overwrite:
+                if ledger is not None and ledger.adopt(source, destination, params, [destination]):
+                    logger.info("已有输出晚于源文件，按当前参数记入账本: %s", destination)
+                if ledger is None or ledger.is_current(source, destination, params):
+                    logger.info("跳过已存在文件: %s", destination)
+                    result.skipped += 1
+                    completed += 1
+                    report_progress(progress, "running", f"已跳过: {source.name}", current=completed, total=total, item=source)
+                    continue
+                logger.info("源文件或转换参数已变化，重新转换: %s", source)
+                jobs.append(_ConvertJob(index, source, destination, overwrite=True))
+                continue
+            jobs.append(_ConvertJob(index, source, destination, use_overwrite))
+        # 调度、超时和进度都需要时长，先批量读取文件头，后续查询命中缓存。
+        probe_many((job.source for job in jobs), cache=context.media_probe_path())
+        if schedule_name == "longest_first" and len(jobs) > 1:
+            plan = plan_longest_first(jobs, lambda job: estimate_seconds(job.source), workers=worker_count)
+            jobs = plan.items
+            message = (
+                f"按时长从长到短调度 {len(jobs)} 个文件：共 {plan.total_seconds / 3600:.1f} 小时音频，"
+                f"负载最重的任务线程约 {plan.makespan_seconds / 3600:.1f} 小时"
             )
-            if use_validation and not validate_audio(destination, ffmpeg):
-                raise RuntimeError(f"输出验证失败: {destination}")
-            logger.info("转换完成: %s -> %s", source, destination)
-            result.succeeded += 1
-            result.outputs.append(destination)
-        except Exception as exc:
-            logger.exception("转换失败: %s", source)
-            result.failed += 1
-            result.errors.append(str(exc))
-        report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+            logger.info(message)
+            report_progress(progress, "running", message, current=completed, total=total)
+
+        in_flight = _InFlightProgress(completed)
+
+        def on_start(job: _ConvertJob) -> None:
+            done, fraction = in_flight.start()
+            report_progress(
+                progress,
+                "running",
+                f"正在转换: {job.source.name}",
+                current=done,
+                total=total,
+                item=job.source,
+                fraction=fraction,
+            )
+
+        def on_encode(job: _ConvertJob, event: EncodeProgress) -> None:
+            speed = f"，{event.speed}" if event.speed else ""
+            done, fraction = in_flight.update(job.index, event.fraction)
+            report_progress(
+                progress,
+                "running",
+                f"正在转换: {job.source.name} {event.fraction:.0%}{speed}",
+                current=done,
+                total=total,
+                item=job.source,
+                fraction=fraction,
+            )
+
+        convert = partial(
+            _convert_one,
+            bitrate=target_bitrate,
+            ffmpeg=ffmpeg,
+            validate=use_validation,
+            on_progress=on_encode if progress is not None else None,
+            cancel_token=cancel_token,
+            timeout_base_seconds=timeout_base,
+            timeout_factor=timeout_factor,
+        )
+        outputs: dict[int, Path] = {}
+        errors: dict[int, str] = {}
+        for outcome in run_concurrently(convert, jobs, workers=worker_count, cancel_token=cancel_token, on_start=on_start):
+            job = outcome.item
+            if outcome.error is None:
+                logger.info("转换完成: %s -> %s", job.source, job.destination)
+                result.succeeded += 1
+                outputs[job.index] = job.destination
+                if ledger is not None:
+                    ledger.record(job.source, job.destination, params, [job.destination])
+            else:
+                logger.error("转换失败: %s", job.source, exc_info=outcome.error)
+                result.failed += 1
+                errors[job.index] = str(outcome.error)
+            done, remaining = in_flight.finish(job.index)
+            report_progress(
+                progress,
+                "running",
+                f"已处理: {job.source.name}",
+                current=done,
+                total=total,
+                item=job.source,
+                fraction=remaining,
+            )
+    finally:
+        if ledger is not None:
+            ledger.close()
+    result.outputs.extend(outputs[index] for index in sorted(outputs))
+    result.errors.extend(errors[index] for index in sorted(errors))
     report_progress(progress, "completed", "音频转换完成", current=total, total=total)
     return result
+
+
+def _convert_one(
+    job: _ConvertJob,
+    *,
+    bitrate: str,
+    ffmpeg: str,
+    validate: bool,
+    on_progress: Callable[[_ConvertJob, EncodeProgress], None] | None,
+    cancel_token: CancellationToken | None,
+    timeout_base_seconds: float,
+    timeout_factor: float,
+) -> Path:
+    timeout = None
+    if timeout_base_seconds > 0:
+        # 文件头读不出时长时按文件大小估算，避免较长的有效输入只得到 base 超时而被提前终止。
+        timeout = watchdog_timeout(estimate_seconds(job.source), base_seconds=timeout_base_seconds, factor=timeout_factor)
+    convert_to_mp3(
+        job.source,
+        job.destination,
+        bitrate=bitrate,
+        overwrite=job.overwrite,
+        ffmpeg_executable=ffmpeg,
+        on_progress=partial(on_progress, job) if on_progress is not None else None,
+        cancel_token=cancel_token,
+        timeout_seconds=timeout,
+    )
+    if validate and not verify_mp3(job.destination):
+        job.destination.unlink(missing_ok=True)
+        raise RuntimeError(f"输出验证失败: {job.destination}")
+    return job.destination
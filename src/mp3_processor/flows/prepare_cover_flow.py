@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
 
 from logging_config import get_logger
 from mp3_processor.context import AppContext
-from mp3_processor.execution import CancellationToken, ProgressCallback, check_cancelled, report_progress
+from mp3_processor.execution import (
+    CancellationToken,
+    ProgressCallback,
+    check_cancelled,
+    report_progress,
+    resolve_workers,
+    run_concurrently,
+)
 from mp3_processor.modules.cover_editor import crop_image
-from mp3_processor.modules.files import IMAGE_EXTENSIONS, iter_files, output_path_for
+from mp3_processor.modules.files import IMAGE_EXTENSIONS, iter_files, output_path_for, sweep_temp_files
 from mp3_processor.results import FlowResult
 
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class _CropJob:
+    index: int
+    source: Path
+    destination: Path
+    crop_box: tuple[int, int, int, int]
+
+
 def run(
     context: AppContext,
     *,
@@ -24,10 +40,15 @@ def run(
     recursive: bool | None = None,
     overwrite: bool | None = None,
     max_files: int | None = None,
+    workers: int | None = None,
+    full_rescan: bool = False,
     progress: ProgressCallback | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> FlowResult:
-    """发现图片并按配置的矩形区域批量裁剪。"""
+    """发现图片并按配置的矩形区域批量裁剪。
+
+    workers 未配置时为 0，按 CPU 核数在多个进程中并行裁剪；图片解码和重新编码受 CPU 限制，线程无法绕过 GIL。
+    """
     config = context.flow_config("prepare_cover")
     source_root = context.resolve_path(input_path or config.get("input_path", "assets/cover_images/input"))
     target_root = context.resolve_path(output_dir or config.get("output_dir", "output/covers"))
@@ -42,31 +63,67 @@ def run(
     )
     use_recursive = bool(config.get("recursive", True)) if recursive is None else recursive
     use_overwrite = bool(config.get("overwrite", False)) if overwrite is None else overwrite
+    worker_count = resolve_workers(int(config.get("workers", 0)) if workers is None else workers)
     report_progress(progress, "scanning", f"正在扫描: {source_root}")
-    files = list(iter_files(source_root, IMAGE_EXTENSIONS, recursive=use_recursive))
+    files = list(
+        iter_files(
+            source_root,
+            IMAGE_EXTENSIONS,
+            recursive=use_recursive,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
+        )
+    )
     limit = max_files if max_files is not None else int(config.get("max_files", 0))
     if limit > 0:
         files = files[:limit]
     result = FlowResult(discovered=len(files))
+    for orphan in sweep_temp_files(target_root):
+        logger.info("删除中断遗留的临时文件: %s", orphan)
     total = len(files)
     report_progress(progress, "running", f"发现 {total} 张待处理图片", total=total)
-    for index, source in enumerate(files, start=1):
+    completed = 0
+    jobs: list[_CropJob] = []
+    for index, source in enumerate(files):
         check_cancelled(cancel_token)
-        report_progress(progress, "running", f"正在裁剪: {source.name}", current=index - 1, total=total, item=source)
         destination = output_path_for(source, source_root, target_root, source.suffix.lower())
         if destination.exists() and not use_overwrite:
             result.skipped += 1
-            report_progress(progress, "running", f"已跳过: {source.name}", current=index, total=total, item=source)
+            completed += 1
+            report_progress(progress, "running", f"已跳过: {source.name}", current=completed, total=total, item=source)
             continue
-        try:
-            crop_image(source, destination, crop_box)
-            logger.info("封面裁剪完成: %s -> %s", source, destination)
+        jobs.append(_CropJob(index, source, destination, crop_box))
+
+    def on_start(job: _CropJob) -> None:
+        report_progress(progress, "running", f"正在裁剪: {job.source.name}", current=completed, total=total, item=job.source)
+
+    outputs: dict[int, Path] = {}
+    errors: dict[int, str] = {}
+    for outcome in run_concurrently(
+        _crop,
+        jobs,
+        workers=worker_count,
+        cancel_token=cancel_token,
+        on_start=on_start,
+        use_processes=True,
+    ):
+        job = outcome.item
+        if outcome.error is None:
+            logger.info("封面裁剪完成: %s -> %s", job.source, job.destination)
             result.succeeded += 1
-            result.outputs.append(destination)
-        except Exception as exc:
-            logger.exception("封面裁剪失败: %s", source)
+            outputs[job.index] = job.destination
+        else:
+            logger.error("封面裁剪失败: %s", job.source, exc_info=outcome.error)
             result.failed += 1
-            result.errors.append(str(exc))
-        report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+            errors[job.index] = str(outcome.error)
+        completed += 1
+        report_progress(progress, "running", f"已处理: {job.source.name}", current=completed, total=total, item=job.source)
+    result.outputs.extend(outputs[index] for index in sorted(outputs))
+    result.errors.extend(errors[index] for index in sorted(errors))
     report_progress(progress, "completed", "封面裁剪完成", current=total, total=total)
     return result
+
+
+def _crop(job: _CropJob) -> Path:
+    # 在工作进程中执行，必须是可 pickle 的模块级函数。
+    return crop_image(job.source, job.destination, job.crop_box)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
 
 from logging_config import get_logger
@@ -12,9 +13,13 @@ from mp3_processor.execution import (
     TaskCancelled,
     check_cancelled,
     report_progress,
+    resolve_workers,
 )
-from mp3_processor.modules.audio_splitter import split_audio
-from mp3_processor.modules.files import iter_files
+from mp3_processor.modules.audio_converter import EncodeProgress
+from mp3_processor.modules.audio_splitter import planned_outputs, split_audio
+from mp3_processor.modules.files import iter_files, sweep_temp_files
+from mp3_processor.modules.ledger import ProcessingLedger
+from mp3_processor.modules.media_probe import probe_many
 from mp3_processor.results import FlowResult
 
 
@@ -32,11 +37,20 @@ def run(
     bitrate: str | None = None,
     ffmpeg_executable: str | None = None,
     overwrite: bool | None = None,
+    mode: str | None = None,
+    workers: int | None = None,
+    silence_window_seconds: float | None = None,
+    use_ledger: bool | None = None,
     max_files: int | None = None,
+    timeout_base_seconds: float | None = None,
+    full_rescan: bool = False,
     progress: ProgressCallback | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> FlowResult:
-    """发现音频并按固定时长切分到独立输出目录。"""
+    """发现音频并逐个切分到独立输出目录；mode 选择切分引擎，workers 为单个文件内并行的分段数。
+
+    use_ledger 时跳过指纹和参数都未变化的文件，重新切分时清理上次多出的旧分段。
+    """
     config = context.flow_config("split_audio")
     source_root = context.resolve_path(input_path or config.get("input_path", context.config["app"]["input_path"]))
     target_root = context.resolve_path(output_dir or config.get("output_dir", "output/split"))
@@ -45,42 +59,128 @@ def run(
     use_overwrite = bool(config.get("overwrite", False)) if overwrite is None else overwrite
     segment_minutes = float(config.get("duration_minutes", 30)) if duration_minutes is None else duration_minutes
     target_bitrate = bitrate or str(config.get("bitrate", "192k"))
+    split_mode = mode or str(config.get("mode", "decode"))
+    worker_count = resolve_workers(int(config.get("workers", 1)) if workers is None else workers)
+    silence_window = float(config.get("silence_window_seconds", 0)) if silence_window_seconds is None else silence_window_seconds
+    silence_threshold = float(config.get("silence_threshold_db", -40))
     ffmpeg = ffmpeg_executable or str(config.get("ffmpeg", context.config.get("app", {}).get("ffmpeg", "ffmpeg")))
+    timeout_base = float(config.get("timeout_base_seconds", 0)) if timeout_base_seconds is None else timeout_base_seconds
+    timeout_factor = float(config.get("timeout_factor", 0.1))
     report_progress(progress, "scanning", f"正在扫描: {source_root}")
-    files = list(iter_files(source_root, extensions, recursive=use_recursive))
+    files = list(
+        iter_files(
+            source_root,
+            extensions,
+            recursive=use_recursive,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
+        )
+    )
     limit = max_files if max_files is not None else int(config.get("max_files", 0))
     if limit > 0:
         files = files[:limit]
     result = FlowResult(discovered=len(files))
+    for orphan in sweep_temp_files(target_root):
+        logger.info("删除中断遗留的临时文件: %s", orphan)
+    probe_many(files, cache=context.media_probe_path())
+    ledger_enabled = bool(config.get("ledger", False)) if use_ledger is None else use_ledger
+    ledger = ProcessingLedger(context.ledger_path(), hash_sources=bool(config.get("ledger_hash", False))) if ledger_enabled else None
+    if split_mode == "markers":
+        # 章节切分只复制音频流，切分点来自章节或 CUE；时长、码率和静音对齐都不影响输出。
+        base_params: dict[str, object] = {"mode": split_mode}
+    else:
+        base_params = {"duration_minutes": segment_minutes, "bitrate": target_bitrate, "mode": split_mode}
+        if silence_window > 0:
+            base_params.update(silence_window_seconds=silence_window, silence_threshold_db=silence_threshold)
     total = len(files)
     report_progress(progress, "running", f"发现 {total} 个待处理文件", total=total)
-    for index, source in enumerate(files, start=1):
-        check_cancelled(cancel_token)
-        report_progress(progress, "running", f"正在分割: {source.name}", current=index - 1, total=total, item=source)
-        relative_dir = source.parent.relative_to(source_root)
-        destination_dir = target_root / relative_dir / source.stem
-        try:
-            outputs = split_audio(
-                source,
-                destination_dir,
-                duration_minutes=segment_minutes,
-                bitrate=target_bitrate,
-                overwrite=use_overwrite,
-                ffmpeg_executable=ffmpeg,
-                cancel_token=cancel_token,
-            )
-            logger.info("切分完成: %s，共 %d 段", source, len(outputs))
-            result.succeeded += 1
-            result.outputs.extend(outputs)
-        except FileExistsError as exc:
-            logger.info("跳过已有输出: %s", exc)
-            result.skipped += 1
-        except TaskCancelled:
-            raise
-        except Exception as exc:
-            logger.exception("切分失败: %s", source)
-            result.failed += 1
-            result.errors.append(str(exc))
-        report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+    try:
+        for index, source in enumerate(files, start=1):
+            check_cancelled(cancel_token)
+            report_progress(progress, "running", f"正在分割: {source.name}", current=index - 1, total=total, item=source)
+            relative_dir = source.parent.relative_to(source_root)
+            destination_dir = target_root / relative_dir / source.stem
+            file_overwrite = use_overwrite
+            params = _ledger_params(base_params, source, split_mode)
+            previous: list[Path] = []
+            if ledger is not None and not use_overwrite:
+                expected = planned_outputs(source, destination_dir, duration_minutes=segment_minutes, mode=split_mode)
+                if ledger.adopt(source, destination_dir, params, expected):
+                    logger.info("已有分段晚于源文件，按当前参数记入账本: %s", destination_dir)
+                if ledger.is_current(source, destination_dir, params):
+                    logger.info("源文件与切分参数未变化，跳过: %s", source)
+                    result.skipped += 1
+                    report_progress(progress, "running", f"已跳过: {source.name}", current=index, total=total, item=source)
+                    continue
+                entry = ledger.lookup(source, destination_dir)
+                previous = entry.outputs if entry is not None else []
+                file_overwrite = True
+            try:
+                outputs = split_audio(
+                    source,
+                    destination_dir,
+                    duration_minutes=segment_minutes,
+                    bitrate=target_bitrate,
+                    overwrite=file_overwrite,
+                    ffmpeg_executable=ffmpeg,
+                    mode=split_mode,
+                    cancel_token=cancel_token,
+                    on_progress=partial(_report_media_progress, progress, source, index - 1, total) if progress else None,
+                    timeout_base_seconds=timeout_base,
+                    timeout_factor=timeout_factor,
+                    workers=worker_count,
+                    silence_window_seconds=silence_window,
+                    silence_threshold_db=silence_threshold,
+                )
+                logger.info("切分完成: %s，共 %d 段", source, len(outputs))
+                result.succeeded += 1
+                result.outputs.extend(outputs)
+                if ledger is not None:
+                    for stale in set(previous) - set(outputs):
+                        stale.unlink(missing_ok=True)
+                    ledger.record(source, destination_dir, params, outputs)
+            except FileExistsError as exc:
+                logger.info("跳过已有输出: %s", exc)
+                result.skipped += 1
+            except TaskCancelled:
+                raise
+            except Exception as exc:
+                logger.exception("切分失败: %s", source)
+                result.failed += 1
+                result.errors.append(str(exc))
+            report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+    finally:
+        if ledger is not None:
+            ledger.close()
     report_progress(progress, "completed", "音频分割完成", current=total, total=total)
     return result
+
+
+def _ledger_params(base_params: dict[str, object], source: Path, mode: str) -> dict[str, object]:
+    """返回账本参数：copy 模式的 MP3 源直接复制帧，去掉码率；markers 模式加入同名 `.cue` 的大小和修改时间。"""
+    if mode == "copy" and source.suffix.lower() == ".mp3":
+        return {key: value for key, value in base_params.items() if key != "bitrate"}
+    cue = source.with_suffix(".cue")
+    if mode != "markers" or not cue.is_file():
+        return base_params
+    stat = cue.stat()
+    return {**base_params, "cue_size": stat.st_size, "cue_mtime_ns": stat.st_mtime_ns}
+
+
+def _report_media_progress(
+    progress: ProgressCallback | None,
+    source: Path,
+    current: int,
+    total: int,
+    event: EncodeProgress,
+) -> None:
+    speed = f"，{event.speed}" if event.speed else ""
+    report_progress(
+        progress,
+        "running",
+        f"正在分割: {source.name} {event.fraction:.0%}{speed}",
+        current=current,
+        total=total,
+        item=source,
+        fraction=event.fraction,
+    )
@@ -0,0 +1,153 @@
+"""一次打开同时更新音频元数据和封面的工作流。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from logging_config import get_logger
+from mp3_processor.context import AppContext
+from mp3_processor.execution import (
+    CancellationToken,
+    ProgressCallback,
+    check_cancelled,
+    report_progress,
+    resolve_workers,
+    run_concurrently,
+)
+from mp3_processor.modules.cover_editor import load_configured_cover
+from mp3_processor.modules.files import iter_files
+from mp3_processor.modules.metadata_editor import album_for_file, title_from_filename
+from mp3_processor.modules.padding import PaddingPolicy
+from mp3_processor.modules.tag_writer import TagJob, TagWriteResult, write_tags_and_cover
+from mp3_processor.results import FlowResult
+
+
+logger = get_logger(__name__)
+
+
+def run(
+    context: AppContext,
+    *,
+    input_path: str | Path | None = None,
+    cover_image: str | Path | None = None,
+    recursive: bool | None = None,
+    artist: str | None = None,
+    album: str | None = None,
+    include_folder_in_album: bool | None = None,
+    replace_existing: bool | None = None,
+    cover_max_pixels: int | None = None,
+    cover_max_kb: int | None = None,
+    write: bool = False,
+    max_files: int | None = None,
+    workers: int | None = None,
+    full_rescan: bool = False,
+    progress: ProgressCallback | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> FlowResult:
+    """为 MP3/M4A/WMA 设置标题、艺术家、专辑和封面，每个文件只解析和保存一次；默认预览。"""
+    config = context.flow_config("update_metadata")
+    cover_config = context.flow_config("apply_cover")
+    source_root = context.resolve_path(input_path or config.get("input_path", context.config["app"]["input_path"]))
+    cover = context.resolve_path(cover_image or config.get("cover_image") or cover_config.get("cover_image", ""))
+    # 只有实际写入时才读取和压缩封面，预览不处理图片。
+    payload = load_configured_cover(cover, cover_config, cover_max_pixels=cover_max_pixels, cover_max_kb=cover_max_kb) if write else None
+    if payload is not None and len(payload.data) != payload.source_size:
+        logger.info("封面已优化: %s | %.1f KB -> %.1f KB", cover, payload.source_size / 1024, len(payload.data) / 1024)
+    use_recursive = bool(config.get("recursive", True)) if recursive is None else recursive
+    use_replace = bool(cover_config.get("replace_existing", True)) if replace_existing is None else replace_existing
+    report_progress(progress, "scanning", f"正在扫描: {source_root}")
+    files = list(
+        iter_files(
+            source_root,
+            ["mp3", "m4a", "wma"],
+            recursive=use_recursive,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
+        )
+    )
+    limit = max_files if max_files is not None else int(config.get("max_files", 0))
+    if limit > 0:
+        files = files[:limit]
+    result = FlowResult(discovered=len(files))
+    target_artist = config.get("artist") if artist is None else artist
+    base_album = config.get("album") if album is None else album
+    include_folder = bool(config.get("include_folder_in_album", True)) if include_folder_in_album is None else include_folder_in_album
+    worker_count = resolve_workers(int(config.get("workers", 1)) if workers is None else workers)
+    padding = PaddingPolicy(int(config.get("padding_kb", 256)) * 1024)
+    total = len(files)
+    report_progress(progress, "running", f"发现 {total} 个待处理文件", total=total)
+    completed = 0
+    jobs: list[TagJob] = []
+    for index, source in enumerate(files):
+        check_cancelled(cancel_token)
+        target_album = album_for_file(source, source_root, base_album, include_folder)
+        if not write:
+            logger.info(
+                "预览标签与封面: %s | title=%s artist=%s album=%s cover=%s",
+                source,
+                title_from_filename(source),
+                target_artist,
+                target_album,
+                cover,
+            )
+            result.skipped += 1
+            completed += 1
+            report_progress(progress, "running", f"已预览: {source.name}", current=completed, total=total, item=source)
+            continue
+        jobs.append(TagJob(index, source, target_album))
+
+    def on_start(job: TagJob) -> None:
+        report_progress(progress, "running", f"正在写入标签与封面: {job.source.name}", current=completed, total=total, item=job.source)
+
+    def write_file(job: TagJob) -> TagWriteResult:
+        return write_tags_and_cover(
+            job.source,
+            artist=target_artist,
+            album=job.album,
+            cover=payload,
+            replace_cover=use_replace,
+            padding=padding,
+        )
+
+    counts = {"tags_updated": 0, "tags_unchanged": 0, "covers_written": 0, "covers_unchanged": 0}
+    outputs: dict[int, Path] = {}
+    errors: dict[int, str] = {}
+    for outcome in run_concurrently(write_file, jobs, workers=worker_count, cancel_token=cancel_token, on_start=on_start):
+        job = outcome.item
+        written = outcome.value
+        if outcome.error is not None or written is None:
+            logger.error("标签与封面写入失败: %s", job.source, exc_info=outcome.error)
+            result.failed += 1
+            errors[job.index] = str(outcome.error)
+        else:
+            counts["tags_updated" if written.tags_changed else "tags_unchanged"] += 1
+            counts["covers_written" if written.cover_changed else "covers_unchanged"] += 1
+            if written.saved:
+                logger.info("写入完成: %s | 标签%s，封面%s", job.source, _changed(written.tags_changed), _changed(written.cover_changed))
+                result.succeeded += 1
+                outputs[job.index] = job.source
+            else:
+                logger.info("标签与封面均未变化，跳过写入: %s", job.source)
+                result.unchanged += 1
+        completed += 1
+        report_progress(progress, "running", f"已处理: {job.source.name}", current=completed, total=total, item=job.source)
+    result.outputs.extend(outputs[index] for index in sorted(outputs))
+    result.errors.extend(errors[index] for index in sorted(errors))
+    result.stats.update(counts)
+    result.stats.update(padding.stats())
+    if write:
+        logger.info(
+            "标签更新 %d 个、未变化 %d 个，封面写入 %d 个、已相同 %d 个；原地写入 %d 个，整文件重写 %d 个",
+            counts["tags_updated"],
+            counts["tags_unchanged"],
+            counts["covers_written"],
+            counts["covers_unchanged"],
+            padding.in_place,
+            padding.rewrites,
+        )
+    report_progress(progress, "completed", "元数据与封面任务完成", current=total, total=total)
+    return result
+
+
+def _changed(changed: bool) -> str:
+    return "已更新" if changed else "未变化"
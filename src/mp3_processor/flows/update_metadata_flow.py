@@ -6,9 +6,18 @@ from pathlib import Path
 
 from logging_config import get_logger
 from mp3_processor.context import AppContext
-from mp3_processor.execution import CancellationToken, ProgressCallback, check_cancelled, report_progress
+from mp3_processor.execution import (
+    CancellationToken,
+    ProgressCallback,
+    check_cancelled,
+    report_progress,
+    resolve_workers,
+    run_concurrently,
+)
 from mp3_processor.modules.files import iter_files
 from mp3_processor.modules.metadata_editor import album_for_file, title_from_filename, update_audio_tags
+from mp3_processor.modules.padding import PaddingPolicy
+from mp3_processor.modules.tag_writer import TagJob
 from mp3_processor.results import FlowResult
 
 
@@ -25,15 +34,30 @@ def run(
     include_folder_in_album: bool | None = None,
     write: bool = False,
     max_files: int | None = None,
+    workers: int | None = None,
+    full_rescan: bool = False,
     progress: ProgressCallback | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> FlowResult:
-    """为 MP3/M4A 设置标题、艺术家和专辑；默认预览。"""
+    """为 MP3/M4A 设置标题、艺术家和专辑；默认预览。
+
+    workers 控制同时写入的文件数；网络存储上标签写入主要受 I/O 延迟限制，适合多线程并行。
+    现有标签已与目标一致的文件不会被重写，计入 unchanged。标签区首次扩大时预留 padding_kb 空白，
+    原地写入与整文件重写的次数记录在 result.stats。
+    """
     config = context.flow_config("update_metadata")
     source_root = context.resolve_path(input_path or config.get("input_path", context.config["app"]["input_path"]))
     use_recursive = bool(config.get("recursive", True)) if recursive is None else recursive
     report_progress(progress, "scanning", f"正在扫描: {source_root}")
-    files = list(iter_files(source_root, ["mp3", "m4a"], recursive=use_recursive))
+    files = list(
+        iter_files(
+            source_root,
+            ["mp3", "m4a"],
+            recursive=use_recursive,
+            index=context.scan_index_path(),
+            rescan=full_rescan,
+        )
+    )
     limit = max_files if max_files is not None else int(config.get("max_files", 0))
     if limit > 0:
         files = files[:limit]
@@ -41,11 +65,14 @@ def run(
     target_artist = config.get("artist") if artist is None else artist
     base_album = config.get("album") if album is None else album
     include_folder = bool(config.get("include_folder_in_album", True)) if include_folder_in_album is None else include_folder_in_album
+    worker_count = resolve_workers(int(config.get("workers", 1)) if workers is None else workers)
+    padding = PaddingPolicy(int(config.get("padding_kb", 256)) * 1024)
     total = len(files)
     report_progress(progress, "running", f"发现 {total} 个待处理文件", total=total)
-    for index, source in enumerate(files, start=1):
+    completed = 0
+    jobs: list[TagJob] = []
+    for index, source in enumerate(files):
         check_cancelled(cancel_token)
-        report_progress(progress, "running", f"正在处理元数据: {source.name}", current=index - 1, total=total, item=source)
         target_album = album_for_file(
             source,
             source_root,
@@ -55,17 +82,38 @@ def run(
         if not write:
             logger.info("预览标签: %s | title=%s artist=%s album=%s", source, title_from_filename(source), target_artist, target_album)
             result.skipped += 1
-            report_progress(progress, "running", f"已预览: {source.name}", current=index, total=total, item=source)
+            completed += 1
+            report_progress(progress, "running", f"已预览: {source.name}", current=completed, total=total, item=source)
             continue
-        try:
-            update_audio_tags(source, artist=target_artist, album=target_album)
-            logger.info("标签更新完成: %s", source)
+        jobs.append(TagJob(index, source, target_album))
+
+    def on_start(job: TagJob) -> None:
+        report_progress(progress, "running", f"正在处理元数据: {job.source.name}", current=completed, total=total, item=job.source)
+
+    def write_tags(job: TagJob) -> bool:
+        return update_audio_tags(job.source, artist=target_artist, album=job.album, padding=padding)
+
+    outputs: dict[int, Path] = {}
+    errors: dict[int, str] = {}
+    for outcome in run_concurrently(write_tags, jobs, workers=worker_count, cancel_token=cancel_token, on_start=on_start):
+        job = outcome.item
+        if outcome.error is None and not outcome.value:
+            logger.info("标签未变化，跳过写入: %s", job.source)
+            result.unchanged += 1
+        elif outcome.error is None:
+            logger.info("标签更新完成: %s", job.source)
             result.succeeded += 1
-            result.outputs.append(source)
-        except Exception as exc:
-            logger.exception("标签更新失败: %s", source)
+            outputs[job.index] = job.source
+        else:
+            logger.error("标签更新失败: %s", job.source, exc_info=outcome.error)
             result.failed += 1
-            result.errors.append(str(exc))
-        report_progress(progress, "running", f"已处理: {source.name}", current=index, total=total, item=source)
+            errors[job.index] = str(outcome.error)
+        completed += 1
+        report_progress(progress, "running", f"已处理: {job.source.name}", current=completed, total=total, item=job.source)
+    result.outputs.extend(outputs[index] for index in sorted(outputs))
+    result.errors.extend(errors[index] for index in sorted(errors))
+    result.stats.update(padding.stats())
+    if write:
+        logger.info("标签写入：原地 %d 个，整文件重写 %d 个", padding.in_place, padding.rewrites)
     report_progress(progress, "completed", "元数据任务完成", current=total, total=total)
     return result
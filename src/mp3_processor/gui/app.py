@@ -211,8 +211,8 @@ class Mp3ProcessorApp:
 
     def cancel_task(self) -> None:
         if self.runner.cancel():
-            self.status_variable.set("状态：正在取消，将在安全处理边界停止…")
-            self._append_log("已请求取消任务；当前文件安全结束后停止。")
+            self.status_variable.set("状态：正在取消，正在终止运行中的 FFmpeg 进程…")
+            self._append_log("已请求取消任务；运行中的 FFmpeg 会被终止并清理未完成输出，其他步骤在当前文件结束后停止。")
 
     def preview_parameters(self, name: str, parameters: dict[str, object]) -> None:
         rendered = json.dumps(parameters, ensure_ascii=False, indent=2, default=str)
@@ -235,16 +235,16 @@ class Mp3ProcessorApp:
             self._append_log(f"开始执行：{message.payload}")
         elif message.kind == "progress" and isinstance(message.payload, ProgressEvent):
             event = message.payload
-            percent = event.current * 100 / event.total if event.total else 0
-            self.progress.configure(value=percent)
+            self.progress.configure(value=event.percent)
             suffix = f"（{event.current}/{event.total}）" if event.total else ""
             self.status_variable.set(f"状态：{event.message}{suffix}")
         elif message.kind == "completed" and isinstance(message.payload, FlowResult):
             result = message.payload
             self.progress.configure(value=100)
+            unchanged = f"，未变化 {result.unchanged}" if result.unchanged else ""
             summary = (
                 f"完成：发现 {result.discovered}，成功 {result.succeeded}，"
-                f"跳过 {result.skipped}，失败 {result.failed}"
+                f"跳过 {result.skipped}{unchanged}，失败 {result.failed}"
             )
             self.status_variable.set(f"状态：{summary}")
             self._append_log(summary)
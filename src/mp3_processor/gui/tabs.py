@@ -17,10 +17,13 @@ from mp3_processor.flows import (
     convert_audio_flow,
     prepare_cover_flow,
     split_audio_flow,
+    update_metadata_and_cover_flow,
     update_metadata_flow,
 )
 from mp3_processor.gui.task_runner import Task
 from mp3_processor.gui.widgets import PathField
+from mp3_processor.modules.audio_splitter import SPLIT_MODES
+from mp3_processor.modules.scheduling import SCHEDULES
 from mp3_processor.results import FlowResult
 
 
@@ -170,9 +173,12 @@ class ConvertTab(WorkflowTab):
         self.bitrate = tk.StringVar(self, "192k")
         self.max_files = tk.StringVar(self, "0")
         self.max_depth = tk.StringVar(self, "0")
+        self.workers = tk.StringVar(self, "1")
+        self.schedule = tk.StringVar(self, "path")
         self.recursive = tk.BooleanVar(self, True)
         self.overwrite = tk.BooleanVar(self, False)
         self.validate_output = tk.BooleanVar(self, True)
+        self.use_ledger = tk.BooleanVar(self, False)
         self.extensions = {name: tk.BooleanVar(self, name in {"m4a", "mp4", "wma"}) for name in ("m4a", "mp4", "wma", "wav", "flac")}
 
         container = self.form
@@ -197,12 +203,16 @@ class ConvertTab(WorkflowTab):
         ttk.Entry(options, textvariable=self.max_files, width=10).grid(row=1, column=3, sticky="w")
         ttk.Label(options, text="最大递归深度 (0=无限制)").grid(row=1, column=4, sticky="e", padx=(24, 12))
         ttk.Entry(options, textvariable=self.max_depth, width=10).grid(row=1, column=5, sticky="w")
+        self.add_entry(2, "并行任务数 (0=CPU 核数)", self.workers, width=10)
+        ttk.Label(options, text="调度顺序").grid(row=2, column=2, sticky="e", padx=(24, 12))
+        ttk.Combobox(options, textvariable=self.schedule, values=SCHEDULES, width=14, state="readonly").grid(row=2, column=3, sticky="w")
         controls = ttk.Frame(options)
-        controls.grid(row=2, column=0, columnspan=6, sticky="w", pady=5)
+        controls.grid(row=3, column=0, columnspan=6, sticky="w", pady=5)
         ttk.Checkbutton(controls, text="递归扫描子目录", variable=self.recursive).pack(side="left", padx=(0, 16))
         ttk.Checkbutton(controls, text="覆盖已有文件", variable=self.overwrite).pack(side="left", padx=(0, 16))
-        ttk.Checkbutton(controls, text="校验输出有效性", variable=self.validate_output).pack(side="left")
-        self.add_actions(3)
+        ttk.Checkbutton(controls, text="校验输出有效性", variable=self.validate_output).pack(side="left", padx=(0, 16))
+        ttk.Checkbutton(controls, text="源文件或参数变化时重新转换", variable=self.use_ledger).pack(side="left")
+        self.add_actions(4)
 
     def collect_parameters(self) -> dict[str, object]:
         extensions = [name for name, variable in self.extensions.items() if variable.get()]
@@ -217,7 +227,10 @@ class ConvertTab(WorkflowTab):
             "bitrate": self.required(self.bitrate.get(), "目标比特率"),
             "overwrite": self.overwrite.get(),
             "validate_output": self.validate_output.get(),
+            "use_ledger": self.use_ledger.get(),
             "max_files": self.nonnegative_int(self.max_files.get(), "最大文件数"),
+            "workers": self.nonnegative_int(self.workers.get(), "并行任务数"),
+            "schedule": self.schedule.get(),
         }
 
     def execute(self, context: AppContext, parameters: dict[str, object], token: CancellationToken, progress: ProgressCallback) -> FlowResult:
@@ -229,9 +242,12 @@ class ConvertTab(WorkflowTab):
         self.bitrate.set(config.get("bitrate", "192k"))
         self.max_files.set(str(config.get("max_files", 0)))
         self.max_depth.set(str(config.get("max_depth", 0)))
+        self.workers.set(str(config.get("workers", 1)))
+        self.schedule.set(str(config.get("schedule", "path")))
         self.recursive.set(bool(config.get("recursive", True)))
         self.overwrite.set(bool(config.get("overwrite", False)))
         self.validate_output.set(bool(config.get("validate_output", True)))
+        self.use_ledger.set(bool(config.get("ledger", False)))
         selected = set(config.get("input_extensions", []))
         for name, variable in self.extensions.items():
             variable.set(name in selected)
@@ -245,21 +261,35 @@ class MetadataTab(WorkflowTab):
         self.input_path = tk.StringVar(self)
         self.artist = tk.StringVar(self)
         self.album = tk.StringVar(self)
+        self.cover_image = tk.StringVar(self)
         self.max_files = tk.StringVar(self, "0")
+        self.workers = tk.StringVar(self, "1")
         self.recursive = tk.BooleanVar(self, True)
         self.include_folder = tk.BooleanVar(self, True)
+        self.embed_cover = tk.BooleanVar(self, False)
         self.write = tk.BooleanVar(self, False)
         self.add_path(0, "输入目录", self.input_path)
         self.add_entry(1, "艺术家 (Artist)", self.artist)
         self.add_entry(2, "专辑 (Album)", self.album)
-        self.add_entry(3, "最大文件数 (0=无限制)", self.max_files)
-        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=4, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="将文件夹名加入专辑", variable=self.include_folder).grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="实际写入（未选中时仅预览）", variable=self.write).grid(row=6, column=0, columnspan=2, sticky="w", pady=4)
-        self.add_actions(7)
+        self.add_path(
+            3,
+            "封面图片",
+            self.cover_image,
+            mode="file",
+            filetypes=(("封面图片", "*.png *.jpg *.jpeg"), ("所有文件", "*")),
+        )
+        self.add_entry(4, "最大文件数 (0=无限制)", self.max_files)
+        self.add_entry(5, "并行写入数 (0=CPU 核数)", self.workers)
+        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=6, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="将文件夹名加入专辑", variable=self.include_folder).grid(row=7, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="同时写入封面（每个文件只保存一次）", variable=self.embed_cover).grid(
+            row=8, column=0, columnspan=2, sticky="w", pady=4
+        )
+        ttk.Checkbutton(self.form, text="实际写入（未选中时仅预览）", variable=self.write).grid(row=9, column=0, columnspan=2, sticky="w", pady=4)
+        self.add_actions(10)
 
     def collect_parameters(self) -> dict[str, object]:
-        return {
+        parameters: dict[str, object] = {
             "input_path": self.required(self.input_path.get(), "输入目录"),
             "artist": self.artist.get().strip(),
             "album": self.album.get().strip(),
@@ -267,18 +297,27 @@ class MetadataTab(WorkflowTab):
             "include_folder_in_album": self.include_folder.get(),
             "write": self.write.get(),
             "max_files": self.nonnegative_int(self.max_files.get(), "最大文件数"),
+            "workers": self.nonnegative_int(self.workers.get(), "并行写入数"),
         }
+        if self.embed_cover.get():
+            parameters["cover_image"] = self.required(self.cover_image.get(), "封面图片")
+        return parameters
 
     def execute(self, context: AppContext, parameters: dict[str, object], token: CancellationToken, progress: ProgressCallback) -> FlowResult:
+        if "cover_image" in parameters:
+            return update_metadata_and_cover_flow.run(context, **parameters, progress=progress, cancel_token=token)  # type: ignore[arg-type]
         return update_metadata_flow.run(context, **parameters, progress=progress, cancel_token=token)  # type: ignore[arg-type]
 
     def load_config(self, config: dict[str, Any], app_config: dict[str, Any]) -> None:
         self.input_path.set(config.get("input_path", ""))
         self.artist.set(config.get("artist", ""))
         self.album.set(config.get("album", ""))
+        self.cover_image.set(config.get("cover_image", ""))
         self.max_files.set(str(config.get("max_files", 0)))
         self.recursive.set(bool(config.get("recursive", True)))
         self.include_folder.set(bool(config.get("include_folder_in_album", True)))
+        self.embed_cover.set(bool(config.get("embed_cover", False)))
+        self.workers.set(str(config.get("workers", 1)))
         self.write.set(bool(config.get("write", False)))
 
 
@@ -291,6 +330,7 @@ class PrepareCoverTab(WorkflowTab):
         self.output_dir = tk.StringVar(self)
         self.crop_values = [tk.StringVar(self, "0") for _ in range(4)]
         self.max_files = tk.StringVar(self, "0")
+        self.workers = tk.StringVar(self, "0")
         self.recursive = tk.BooleanVar(self, True)
         self.overwrite = tk.BooleanVar(self, False)
         self.add_path(0, "图片输入目录", self.input_path)
@@ -302,9 +342,10 @@ class PrepareCoverTab(WorkflowTab):
             ttk.Label(crop_box, text=label).pack(side="left", padx=(0, 4))
             ttk.Entry(crop_box, textvariable=variable, width=8).pack(side="left", padx=(0, 12))
         self.add_entry(3, "最大文件数 (0=无限制)", self.max_files)
-        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=4, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="覆盖已有图片", variable=self.overwrite).grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
-        self.add_actions(6)
+        self.add_entry(4, "并行进程数 (0=CPU 核数)", self.workers)
+        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="覆盖已有图片", variable=self.overwrite).grid(row=6, column=0, columnspan=2, sticky="w", pady=4)
+        self.add_actions(7)
 
     def collect_parameters(self) -> dict[str, object]:
         values = tuple(self.nonnegative_int(value.get(), "裁剪坐标") for value in self.crop_values)
@@ -317,6 +358,7 @@ class PrepareCoverTab(WorkflowTab):
             "recursive": self.recursive.get(),
             "overwrite": self.overwrite.get(),
             "max_files": self.nonnegative_int(self.max_files.get(), "最大文件数"),
+            "workers": self.nonnegative_int(self.workers.get(), "并行进程数"),
         }
 
     def execute(self, context: AppContext, parameters: dict[str, object], token: CancellationToken, progress: ProgressCallback) -> FlowResult:
@@ -331,6 +373,7 @@ class PrepareCoverTab(WorkflowTab):
         self.max_files.set(str(config.get("max_files", 0)))
         self.recursive.set(bool(config.get("recursive", True)))
         self.overwrite.set(bool(config.get("overwrite", False)))
+        self.workers.set(str(config.get("workers", 0)))
 
 
 class ApplyCoverTab(WorkflowTab):
@@ -341,6 +384,8 @@ class ApplyCoverTab(WorkflowTab):
         super().__init__(parent, **kwargs)
         self.input_path = tk.StringVar(self)
         self.cover_image = tk.StringVar(self)
+        self.cover_max_pixels = tk.StringVar(self, "0")
+        self.cover_max_kb = tk.StringVar(self, "0")
         self.max_files = tk.StringVar(self, "0")
         self.recursive = tk.BooleanVar(self, True)
         self.replace_existing = tk.BooleanVar(self, True)
@@ -365,11 +410,13 @@ class ApplyCoverTab(WorkflowTab):
             mode="file",
             filetypes=(("封面图片", "*.png *.jpg *.jpeg"), ("所有文件", "*")),
         )
-        self.add_entry(2, "最大文件数 (0=无限制)", self.max_files)
-        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=3, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="替换已有封面", variable=self.replace_existing).grid(row=4, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="实际写入（未选中时仅预览）", variable=self.write).grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
-        self.add_actions(6)
+        self.add_entry(2, "封面最长边 (像素, 0=原图)", self.cover_max_pixels)
+        self.add_entry(3, "封面大小上限 (KB, 0=不限)", self.cover_max_kb)
+        self.add_entry(4, "最大文件数 (0=无限制)", self.max_files)
+        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=5, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="替换已有封面", variable=self.replace_existing).grid(row=6, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="实际写入（未选中时仅预览）", variable=self.write).grid(row=7, column=0, columnspan=2, sticky="w", pady=4)
+        self.add_actions(8)
 
         preview = ttk.LabelFrame(container, text="封面预览", padding=10)
         preview.grid(row=0, column=1, sticky="nsew", padx=(8, 0))
@@ -399,6 +446,8 @@ class ApplyCoverTab(WorkflowTab):
             "cover_image": self.required(self.cover_image.get(), "封面图片"),
             "recursive": self.recursive.get(),
             "replace_existing": self.replace_existing.get(),
+            "cover_max_pixels": self.nonnegative_int(self.cover_max_pixels.get(), "封面最长边"),
+            "cover_max_kb": self.nonnegative_int(self.cover_max_kb.get(), "封面大小上限"),
             "write": self.write.get(),
             "max_files": self.nonnegative_int(self.max_files.get(), "最大文件数"),
         }
@@ -412,6 +461,8 @@ class ApplyCoverTab(WorkflowTab):
         self.max_files.set(str(config.get("max_files", 0)))
         self.recursive.set(bool(config.get("recursive", True)))
         self.replace_existing.set(bool(config.get("replace_existing", True)))
+        self.cover_max_pixels.set(str(config.get("cover_max_pixels", 0)))
+        self.cover_max_kb.set(str(config.get("cover_max_kb", 0)))
         self.write.set(bool(config.get("write", False)))
 
     def _schedule_preview(self, *_args: object) -> None:
@@ -457,9 +508,13 @@ class SplitAudioTab(WorkflowTab):
         self.output_dir = tk.StringVar(self)
         self.duration_minutes = tk.StringVar(self, "30")
         self.bitrate = tk.StringVar(self, "192k")
+        self.mode = tk.StringVar(self, "decode")
+        self.workers = tk.StringVar(self, "1")
+        self.silence_window = tk.StringVar(self, "0")
         self.max_files = tk.StringVar(self, "0")
         self.recursive = tk.BooleanVar(self, True)
         self.overwrite = tk.BooleanVar(self, False)
+        self.use_ledger = tk.BooleanVar(self, False)
         self.extensions = {name: tk.BooleanVar(self, name in {"mp3", "m4a"}) for name in ("mp3", "m4a", "wma", "wav", "flac")}
         self.add_path(0, "音频输入目录", self.input_path)
         self.add_path(1, "分段输出目录", self.output_dir)
@@ -470,10 +525,14 @@ class SplitAudioTab(WorkflowTab):
             ttk.Checkbutton(extension_box, text=name, variable=variable).pack(side="left", padx=(0, 18))
         self.add_entry(3, "每段时长（分钟）", self.duration_minutes)
         self.add_entry(4, "输出比特率", self.bitrate, values=("128k", "192k", "256k", "320k"))
-        self.add_entry(5, "最大文件数 (0=无限制)", self.max_files)
-        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=6, column=0, columnspan=2, sticky="w", pady=4)
-        ttk.Checkbutton(self.form, text="覆盖已有分段", variable=self.overwrite).grid(row=7, column=0, columnspan=2, sticky="w", pady=4)
-        self.add_actions(8)
+        self.add_entry(5, "切分引擎", self.mode, values=SPLIT_MODES)
+        self.add_entry(6, "并行分段数 (0=CPU 核数)", self.workers)
+        self.add_entry(7, "静音对齐窗口（秒，0=关闭）", self.silence_window)
+        self.add_entry(8, "最大文件数 (0=无限制)", self.max_files)
+        ttk.Checkbutton(self.form, text="递归扫描子目录", variable=self.recursive).grid(row=9, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="覆盖已有分段", variable=self.overwrite).grid(row=10, column=0, columnspan=2, sticky="w", pady=4)
+        ttk.Checkbutton(self.form, text="源文件或参数变化时重新切分", variable=self.use_ledger).grid(row=11, column=0, columnspan=2, sticky="w", pady=4)
+        self.add_actions(12)
 
     def collect_parameters(self) -> dict[str, object]:
         extensions = [name for name, variable in self.extensions.items() if variable.get()]
@@ -485,6 +544,12 @@ class SplitAudioTab(WorkflowTab):
             raise ValueError("每段时长必须是数字") from exc
         if duration <= 0:
             raise ValueError("每段时长必须大于 0")
+        try:
+            silence_window = float(self.silence_window.get())
+        except ValueError as exc:
+            raise ValueError("静音对齐窗口必须是数字") from exc
+        if silence_window < 0:
+            raise ValueError("静音对齐窗口不能为负数")
         return {
             "input_path": self.required(self.input_path.get(), "音频输入目录"),
             "output_dir": self.required(self.output_dir.get(), "分段输出目录"),
@@ -492,7 +557,11 @@ class SplitAudioTab(WorkflowTab):
             "recursive": self.recursive.get(),
             "duration_minutes": duration,
             "bitrate": self.required(self.bitrate.get(), "输出比特率"),
+            "mode": self.required(self.mode.get(), "切分引擎"),
+            "workers": self.nonnegative_int(self.workers.get(), "并行分段数"),
+            "silence_window_seconds": silence_window,
             "overwrite": self.overwrite.get(),
+            "use_ledger": self.use_ledger.get(),
             "max_files": self.nonnegative_int(self.max_files.get(), "最大文件数"),
         }
 
@@ -504,9 +573,13 @@ class SplitAudioTab(WorkflowTab):
         self.output_dir.set(config.get("output_dir", ""))
         self.duration_minutes.set(str(config.get("duration_minutes", 30)))
         self.bitrate.set(config.get("bitrate", "192k"))
+        self.mode.set(config.get("mode", "decode"))
+        self.workers.set(str(config.get("workers", 1)))
+        self.silence_window.set(str(config.get("silence_window_seconds", 0)))
         self.max_files.set(str(config.get("max_files", 0)))
         self.recursive.set(bool(config.get("recursive", True)))
         self.overwrite.set(bool(config.get("overwrite", False)))
+        self.use_ledger.set(bool(config.get("ledger", False)))
         selected = set(config.get("input_extensions", []))
         for name, variable in self.extensions.items():
             variable.set(name in selected)
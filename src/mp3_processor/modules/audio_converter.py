@@ -3,20 +3,70 @@
 from __future__ import annotations
 
 import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
+from threading import Thread
 
+import mutagen
+from mutagen.mp3 import MP3
+
+from mp3_processor.execution import CancellationToken, TaskCancelled
+from mp3_processor.modules.files import atomic_output
+from mp3_processor.modules.media_probe import probe_media
 from mp3_processor.platform_tools import resolve_executable
 
 
+# 无损切分时按输出扩展名选择的 FFmpeg 封装格式。
+COPY_MUXERS = {".mp3": "mp3", ".m4a": "ipod", ".m4b": "ipod", ".mp4": "mp4", ".wma": "asf"}
+# 终止 FFmpeg 后等待其退出的时间，超时则强制结束。
+TERMINATE_GRACE_SECONDS = 3.0
+POLL_INTERVAL_SECONDS = 0.1
+
+
 class AudioConversionError(RuntimeError):
     """音频转换失败。"""
 
 
+class AudioTimeoutError(AudioConversionError):
+    """FFmpeg 超过看门狗时限没有进展，已被终止。"""
+
+
+@dataclass(frozen=True)
+class EncodeProgress:
+    """FFmpeg 报告的单文件进度：已处理媒体时长、总时长和编码速度（如 `38.5x`）。"""
+
+    processed_seconds: float
+    duration_seconds: float | None = None
+    speed: str = ""
+
+    @property
+    def fraction(self) -> float:
+        if not self.duration_seconds:
+            return 0.0
+        return min(1.0, max(0.0, self.processed_seconds / self.duration_seconds))
+
+
+EncodeProgressCallback = Callable[[EncodeProgress], None]
+
+
 def require_ffmpeg(executable: str = "ffmpeg") -> str:
     """返回 FFmpeg 路径，不可用时抛出清晰异常。"""
     return resolve_executable(executable, name="FFmpeg")
 
 
+def watchdog_timeout(duration_seconds: float | None, *, base_seconds: float, factor: float) -> float | None:
+    """按媒体时长计算单个 FFmpeg 进程的超时：base_seconds + 时长 × factor。
+
+    factor 应反映编码速度而非播放速度，libmp3lame 通常远快于实时。
+    base_seconds 不大于 0 时不设超时；时长未知时只使用 base_seconds。
+    """
+    if base_seconds <= 0:
+        return None
+    return base_seconds + max(0.0, factor) * (duration_seconds or 0.0)
+
+
 def convert_to_mp3(
     source: Path,
     destination: Path,
@@ -24,39 +74,141 @@ def convert_to_mp3(
     bitrate: str = "192k",
     overwrite: bool = False,
     ffmpeg_executable: str = "ffmpeg",
+    start_seconds: float = 0.0,
+    duration_seconds: float | None = None,
+    copy_stream: bool = False,
+    on_progress: EncodeProgressCallback | None = None,
+    cancel_token: CancellationToken | None = None,
+    timeout_seconds: float | None = None,
+) -> Path:
+    """将一个音频/视频文件（或其中一段时间范围）转换为 MP3，不删除源文件。
+
+    copy_stream 仅适用于 MP3 源：直接复制 MP3 帧而不重新编码，此时忽略 bitrate。
+    on_progress 在编码过程中接收 FFmpeg 的 `-progress` 报告，约每 0.5 秒一次。
+    输出先写入同目录的临时文件，成功后原子替换 destination，中断时不会留下截断的 MP3。
+    cancel_token 被取消时立即终止 FFmpeg、删除临时文件并抛出 TaskCancelled；
+    连续 timeout_seconds 没有进展时同样终止并清理，然后抛出 AudioTimeoutError。
+    """
+    codec = ["-codec:a", "copy"] if copy_stream else ["-codec:a", "libmp3lame", "-b:a", bitrate]
+    return _write_with_ffmpeg(
+        source,
+        destination,
+        ["-vn", *codec, "-f", "mp3"],
+        overwrite=overwrite,
+        ffmpeg_executable=ffmpeg_executable,
+        start_seconds=start_seconds,
+        duration_seconds=duration_seconds,
+        on_progress=on_progress,
+        cancel_token=cancel_token,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+def extract_segment(
+    source: Path,
+    destination: Path,
+    *,
+    start_seconds: float,
+    duration_seconds: float | None = None,
+    overwrite: bool = False,
+    ffmpeg_executable: str = "ffmpeg",
+    on_progress: EncodeProgressCallback | None = None,
+    cancel_token: CancellationToken | None = None,
+    timeout_seconds: float | None = None,
+) -> Path:
+    """直接复制源文件中一段时间范围的音频流，不重新编码；duration_seconds 为 None 时复制到结尾。
+
+    destination 的扩展名决定容器格式，应与源格式一致；输出写入方式、取消和超时行为与 convert_to_mp3 相同。
+    """
+    muxer = COPY_MUXERS.get(destination.suffix.lower())
+    if muxer is None:
+        raise ValueError(f"不支持无损切分的格式: {destination.suffix}")
+    return _write_with_ffmpeg(
+        source,
+        destination,
+        ["-map", "0:a", "-map_chapters", "-1", "-codec:a", "copy", "-f", muxer],
+        overwrite=overwrite,
+        ffmpeg_executable=ffmpeg_executable,
+        start_seconds=start_seconds,
+        duration_seconds=duration_seconds,
+        on_progress=on_progress,
+        cancel_token=cancel_token,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+def _write_with_ffmpeg(
+    source: Path,
+    destination: Path,
+    output_args: list[str],
+    *,
+    overwrite: bool,
+    ffmpeg_executable: str,
+    start_seconds: float,
+    duration_seconds: float | None,
+    on_progress: EncodeProgressCallback | None,
+    cancel_token: CancellationToken | None,
+    timeout_seconds: float | None,
 ) -> Path:
-    """将一个音频/视频文件转换为 MP3，不删除源文件。"""
     if not source.is_file():
         raise FileNotFoundError(f"输入文件不存在: {source}")
     if destination.exists() and not overwrite:
         raise FileExistsError(f"输出文件已存在: {destination}")
-    destination.parent.mkdir(parents=True, exist_ok=True)
     command = [
         require_ffmpeg(ffmpeg_executable),
         "-nostdin",
         "-hide_banner",
         "-loglevel",
         "error",
-        "-y" if overwrite else "-n",
-        "-i",
-        str(source),
-        "-vn",
-        "-codec:a",
-        "libmp3lame",
-        "-b:a",
-        bitrate,
-        str(destination),
+        "-y",
     ]
-    completed = subprocess.run(command, capture_output=True, text=True, encoding="utf-8", errors="replace")
-    if completed.returncode != 0:
-        destination.unlink(missing_ok=True)
-        message = completed.stderr.strip() or "FFmpeg 未返回错误详情"
-        raise AudioConversionError(f"转换失败 {source}: {message}")
+    if start_seconds > 0:
+        command += ["-ss", f"{start_seconds:.3f}"]
+    command += ["-i", str(source)]
+    if duration_seconds is not None:
+        command += ["-t", f"{duration_seconds:.3f}"]
+    total_seconds = duration_seconds
+    if on_progress is not None and total_seconds is None:
+        total_seconds = probe_duration(source)
+        if total_seconds is not None:
+            total_seconds = max(0.0, total_seconds - start_seconds)
+    with atomic_output(destination) as temporary:
+        try:
+            returncode, stderr = _run_ffmpeg(
+                [*command, *output_args, str(temporary)],
+                duration_seconds=total_seconds,
+                on_progress=on_progress,
+                cancel_token=cancel_token,
+                timeout_seconds=timeout_seconds,
+            )
+        except AudioTimeoutError as exc:
+            raise AudioTimeoutError(f"转换超时 {source}: {exc}") from None
+        if returncode != 0:
+            message = stderr.strip() or "FFmpeg 未返回错误详情"
+            raise AudioConversionError(f"转换失败 {source}: {message}")
     return destination
 
 
-def validate_audio(path: Path, ffmpeg_executable: str = "ffmpeg") -> bool:
-    """尝试解码一秒音频，用于快速验证输出文件。"""
+def verify_mp3(path: Path) -> bool:
+    """在进程内解析 MP3 帧头确认输出可读，无需再启动 FFmpeg。"""
+    try:
+        info = MP3(path).info
+    except (mutagen.MutagenError, OSError):
+        return False
+    return info.length > 0 and info.sample_rate > 0
+
+
+def verify_audio(path: Path) -> bool:
+    """在进程内解析任意受支持容器的头部，确认输出包含有效时长。"""
+    try:
+        audio = mutagen.File(path)
+    except (mutagen.MutagenError, OSError):
+        return False
+    return audio is not None and bool(getattr(audio.info, "length", 0))
+
+
+def validate_audio(path: Path, ffmpeg_executable: str = "ffmpeg", *, timeout_seconds: float | None = 60.0) -> bool:
+    """尝试解码一秒音频，用于独立、更严格地验证任意格式的音频文件；超时视为无效。"""
     command = [
         require_ffmpeg(ffmpeg_executable),
         "-nostdin",
@@ -70,4 +222,104 @@ def validate_audio(path: Path, ffmpeg_executable: str = "ffmpeg") -> bool:
         "null",
         "-",
     ]
-    return subprocess.run(command, capture_output=True).returncode == 0
+    try:
+        return subprocess.run(command, capture_output=True, timeout=timeout_seconds).returncode == 0
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def probe_duration(path: Path) -> float | None:
+    """从容器头部读取时长（秒），不解码音频；无法识别时返回 None。结果按文件大小和 mtime 缓存。"""
+    info = probe_media(path)
+    return info.duration_seconds if info is not None else None
+
+
+def _run_ffmpeg(
+    command: list[str],
+    *,
+    duration_seconds: float | None = None,
+    on_progress: EncodeProgressCallback | None = None,
+    cancel_token: CancellationToken | None = None,
+    timeout_seconds: float | None = None,
+) -> tuple[int, str]:
+    """运行 FFmpeg 并返回退出码和 stderr。
+
+    提供 on_progress 或 timeout_seconds 时解析 `-progress pipe:1` 输出；cancel_token 被取消时终止进程并抛出 TaskCancelled。
+    timeout_seconds 是停滞时限：已处理时长每次前进都重新计时，连续超时没有进展时终止进程并抛出 AudioTimeoutError。
+    """
+    if on_progress is not None or timeout_seconds is not None:
+        command = [command[0], "-progress", "pipe:1", "-nostats", *command[1:]]
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    stdout, stderr = process.stdout, process.stderr
+    if stdout is None or stderr is None:
+        raise RuntimeError("无法读取 FFmpeg 输出管道")
+    stderr_lines: list[str] = []
+    # 最近一次已处理时长前进的时间，由读取线程更新。
+    last_advance = [time.monotonic()]
+
+    def read_progress() -> None:
+        fields: dict[str, str] = {}
+        processed = 0.0
+        for line in stdout:
+            key, _, value = line.strip().partition("=")
+            if key != "progress":
+                fields[key] = value
+                continue
+            seconds = _out_time_seconds(fields)
+            if seconds > processed:
+                processed = seconds
+                last_advance[0] = time.monotonic()
+            if on_progress is not None:
+                on_progress(EncodeProgress(seconds, duration_seconds, fields.get("speed", "").strip()))
+
+    readers = [
+        Thread(target=read_progress, daemon=True),
+        Thread(target=lambda: stderr_lines.extend(stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    stop: Exception | None = None
+    while process.poll() is None:
+        if cancel_token is not None and cancel_token.cancelled:
+            stop = TaskCancelled("任务已取消，已终止 FFmpeg 进程")
+        elif timeout_seconds is not None and time.monotonic() - last_advance[0] >= timeout_seconds:
+            stop = AudioTimeoutError(f"FFmpeg 超过 {timeout_seconds:.0f} 秒没有进展，已终止")
+        else:
+            try:
+                process.wait(POLL_INTERVAL_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+            continue
+        _terminate(process)
+    for reader in readers:
+        reader.join()
+    if stop is not None:
+        raise stop
+    return process.returncode, "".join(stderr_lines)
+
+
+def _terminate(process: subprocess.Popen[str]) -> None:
+    process.terminate()
+    try:
+        process.wait(TERMINATE_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _out_time_seconds(fields: dict[str, str]) -> float:
+    # 旧版 FFmpeg 的 out_time_ms 实际单位也是微秒。
+    for key in ("out_time_us", "out_time_ms"):
+        try:
+            return int(fields[key]) / 1_000_000
+        except (KeyError, ValueError):
+            continue
+    return 0.0
@@ -2,12 +2,35 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from contextlib import closing
 from pathlib import Path
+from threading import Lock
 
 from pydub import AudioSegment
 
-from mp3_processor.execution import CancellationToken, check_cancelled
-from mp3_processor.modules.audio_converter import require_ffmpeg, validate_audio
+from mp3_processor.execution import CancellationToken, run_concurrently
+from mp3_processor.modules.audio_converter import (
+    EncodeProgress,
+    EncodeProgressCallback,
+    convert_to_mp3,
+    extract_segment,
+    probe_duration,
+    require_ffmpeg,
+    verify_audio,
+    verify_mp3,
+    watchdog_timeout,
+)
+from mp3_processor.modules.files import atomic_output
+from mp3_processor.modules.markers import marker_paths, read_markers
+from mp3_processor.modules.silence import CHUNK_MS, find_quiet_point, read_analysis_window
+
+
+# decode：pydub 整段解码后切片，每段完成时报告进度。
+# stream：按文件头时长规划分段，每段由 FFmpeg 定位源文件编码，内存占用与音频长度无关。
+# copy：MP3 源按帧边界直接复制，其他格式退回 stream。
+# markers：按同名 .cue 或内嵌章节以源格式复制，以章节标题命名，忽略 duration_minutes。
+SPLIT_MODES = ("decode", "stream", "copy", "markers")
 
 
 def split_audio(
@@ -18,36 +41,231 @@ def split_audio(
     bitrate: str = "192k",
     overwrite: bool = False,
     ffmpeg_executable: str = "ffmpeg",
+    mode: str = "decode",
     cancel_token: CancellationToken | None = None,
+    on_progress: EncodeProgressCallback | None = None,
+    timeout_base_seconds: float = 0.0,
+    timeout_factor: float = 0.0,
+    workers: int = 1,
+    silence_window_seconds: float = 0.0,
+    silence_threshold_db: float = -40.0,
 ) -> list[Path]:
-    """按固定分钟数切分音频，保留最后一个不足时长的片段。"""
+    """按固定分钟数切分音频，保留最后一个不足时长的片段，返回分段路径。
+
+    mode 取 SPLIT_MODES 之一；workers 为同时编码的分段数；on_progress 接收整个源文件的进度。
+    timeout_base_seconds 大于 0 时为每段 FFmpeg 设置 base + 段长 × timeout_factor 的超时。
+    silence_window_seconds 大于 0 时把切分点移到窗口内最近的静音处。
+    """
     if duration_minutes <= 0:
         raise ValueError("duration_minutes 必须大于 0")
-    AudioSegment.converter = require_ffmpeg(ffmpeg_executable)
-    audio = AudioSegment.from_file(source)
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"不支持的切分模式: {mode}")
     duration_ms = int(duration_minutes * 60 * 1000)
-    starts = list(range(0, len(audio), duration_ms))
-    digits = max(2, len(str(len(starts))))
+    progress = _SplitProgress(on_progress)
+    if mode == "markers":
+        return _split_by_markers(
+            source,
+            output_dir,
+            overwrite=overwrite,
+            ffmpeg_executable=ffmpeg_executable,
+            cancel_token=cancel_token,
+            progress=progress,
+            timeout_base_seconds=timeout_base_seconds,
+            timeout_factor=timeout_factor,
+            workers=workers,
+        )
+    if not overwrite:
+        # 先按文件头时长规划分段，已有输出时无需解码即可跳过。
+        _ensure_new_outputs(planned_outputs(source, output_dir, duration_minutes=duration_minutes, mode=mode))
+    seconds = probe_duration(source)
+    if mode in {"stream", "copy"}:
+        copy_stream = mode == "copy" and source.suffix.lower() == ".mp3"
+        if seconds is None:
+            raise RuntimeError(f"无法从文件头读取时长: {source}")
+        total_ms = int(seconds * 1000)
+
+        def load_window(start: int, length: int) -> AudioSegment | None:
+            return read_analysis_window(source, start, length, ffmpeg_executable=ffmpeg_executable)
+
+        def export(start: int, end: int, destination: Path) -> None:
+            def segment_progress(event: EncodeProgress) -> None:
+                progress.update(start, event.processed_seconds, total_ms, event.speed)
+
+            # 最后一段不加 -t 直接复制到文件结尾，文件头时长偏短（如无 Xing 头的 VBR）时不会截掉结尾。
+            is_last = end >= total_ms
+            convert_to_mp3(
+                source,
+                destination,
+                bitrate=bitrate,
+                overwrite=overwrite,
+                ffmpeg_executable=ffmpeg_executable,
+                start_seconds=start / 1000,
+                duration_seconds=None if is_last else (end - start) / 1000,
+                copy_stream=copy_stream,
+                on_progress=segment_progress if on_progress is not None else None,
+                cancel_token=cancel_token,
+                timeout_seconds=watchdog_timeout((end - start) / 1000, base_seconds=timeout_base_seconds, factor=timeout_factor),
+            )
+
+    else:
+        AudioSegment.converter = require_ffmpeg(ffmpeg_executable)
+        audio = AudioSegment.from_file(source)
+        total_ms = len(audio)
+
+        def load_window(start: int, length: int) -> AudioSegment | None:
+            return audio[start : start + length]
+
+        def export(start: int, end: int, destination: Path) -> None:
+            with atomic_output(destination) as temporary:
+                audio[start:end].export(temporary, format="mp3", bitrate=bitrate)
+
+    starts = list(range(0, total_ms, duration_ms))
+    if silence_window_seconds > 0:
+        starts = _snap_to_silence(starts, load_window, int(silence_window_seconds * 1000), duration_ms, silence_threshold_db)
+    # 最后一段始终延伸到结尾；静音对齐把最后一个切分点前移时也不会丢掉尾部。
+    bounds = list(zip(starts, [*starts[1:], total_ms] if starts else []))
+    destinations = segment_paths(source, output_dir, len(bounds))
     output_dir.mkdir(parents=True, exist_ok=True)
-    destinations = [
-        output_dir / f"{source.stem}_part_{index:0{digits}d}.mp3"
-        for index in range(1, len(starts) + 1)
-    ]
+    if not overwrite:
+        _ensure_new_outputs(destinations)
+    return _export_segments(bounds, destinations, export, overwrite, cancel_token, progress, total_ms, workers)
+
+
+def planned_outputs(source: Path, output_dir: Path, *, duration_minutes: float, mode: str = "decode") -> list[Path]:
+    """不解码音频，按章节标记或文件头时长返回预计生成的分段路径；无法确定时返回空列表。"""
+    if mode == "markers":
+        markers = read_markers(source)
+        return marker_paths(source, output_dir, markers) if markers else []
+    seconds = probe_duration(source)
+    if seconds is None:
+        return []
+    return segment_paths(source, output_dir, len(range(0, int(seconds * 1000), int(duration_minutes * 60 * 1000))))
+
+
+def segment_paths(source: Path, output_dir: Path, count: int) -> list[Path]:
+    """返回 `<stem>_part_NN.mp3` 形式的分段输出路径，序号位数随分段数增长。"""
+    digits = max(2, len(str(count)))
+    return [output_dir / f"{source.stem}_part_{index:0{digits}d}.mp3" for index in range(1, count + 1)]
+
+
+def _split_by_markers(
+    source: Path,
+    output_dir: Path,
+    *,
+    overwrite: bool,
+    ffmpeg_executable: str,
+    cancel_token: CancellationToken | None,
+    progress: _SplitProgress,
+    timeout_base_seconds: float,
+    timeout_factor: float,
+    workers: int,
+) -> list[Path]:
+    markers = read_markers(source)
+    if not markers:
+        raise RuntimeError(f"未找到章节或 CUE 标记: {source}")
+    seconds = probe_duration(source)
+    if seconds is None:
+        raise RuntimeError(f"无法从文件头读取时长: {source}")
+    total_ms = int(seconds * 1000)
+    # 第一段从 0 开始，保留第一个标记之前的片头；最后一段一直复制到文件结尾。
+    starts = [0, *(int(marker.start_seconds * 1000) for marker in markers[1:])]
+    bounds = list(zip(starts, [*starts[1:], max(total_ms, starts[-1])]))
+    destinations = marker_paths(source, output_dir, markers)
+    if not overwrite:
+        _ensure_new_outputs(destinations)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def export(start: int, end: int, destination: Path) -> None:
+        def segment_progress(event: EncodeProgress) -> None:
+            progress.update(start, event.processed_seconds, total_ms, event.speed)
+
+        is_last = destination == destinations[-1]
+        extract_segment(
+            source,
+            destination,
+            start_seconds=start / 1000,
+            duration_seconds=None if is_last else (end - start) / 1000,
+            overwrite=overwrite,
+            ffmpeg_executable=ffmpeg_executable,
+            on_progress=segment_progress if progress.on_progress is not None else None,
+            cancel_token=cancel_token,
+            timeout_seconds=watchdog_timeout((end - start) / 1000, base_seconds=timeout_base_seconds, factor=timeout_factor),
+        )
+
+    return _export_segments(bounds, destinations, export, overwrite, cancel_token, progress, total_ms, workers)
+
+
+def _ensure_new_outputs(destinations: list[Path]) -> None:
+    """任一分段已存在时抛出 FileExistsError；已有分段都是完整写入的文件，未开启 overwrite 时一律保留。"""
     existing = next((path for path in destinations if path.exists()), None)
-    if existing and not overwrite:
+    if existing is not None:
         raise FileExistsError(f"输出文件已存在: {existing}")
 
-    outputs: list[Path] = []
+
+class _SplitProgress:
+    """汇总各分段已处理的时长；分段并行编码时整体进度仍单调增长。"""
+
+    def __init__(self, on_progress: EncodeProgressCallback | None) -> None:
+        self.on_progress = on_progress
+        self._processed: dict[int, float] = {}
+        self._lock = Lock()
+
+    def update(self, start: int, processed_seconds: float, total_ms: int, speed: str = "") -> None:
+        if self.on_progress is None:
+            return
+        with self._lock:
+            self._processed[start] = processed_seconds
+            processed = sum(self._processed.values())
+        self.on_progress(EncodeProgress(processed, total_ms / 1000, speed))
+
+
+def _snap_to_silence(
+    starts: list[int],
+    load_window: Callable[[int, int], AudioSegment | None],
+    window_ms: int,
+    duration_ms: int,
+    threshold_dbfs: float,
+) -> list[int]:
+    # 窗口不超过半个分段，移动后的切分点仍保持顺序且每段非空。
+    window_ms = min(window_ms, duration_ms // 2 - CHUNK_MS)
+    if window_ms <= 0:
+        return starts
+    snapped = starts[:1]
+    for cut in starts[1:]:
+        begin = cut - window_ms
+        window = load_window(begin, 2 * window_ms)
+        snapped.append(cut if window is None else begin + find_quiet_point(window, window_ms, threshold_dbfs=threshold_dbfs))
+    return snapped
+
+
+def _export_segments(
+    bounds: list[tuple[int, int]],
+    destinations: list[Path],
+    export: Callable[[int, int, Path], None],
+    overwrite: bool,
+    cancel_token: CancellationToken | None,
+    progress: _SplitProgress,
+    total_ms: int,
+    workers: int,
+) -> list[Path]:
+    def export_one(index: int) -> Path:
+        (start, end), destination = bounds[index], destinations[index]
+        export(start, end, destination)
+        if not (verify_mp3(destination) if destination.suffix.lower() == ".mp3" else verify_audio(destination)):
+            destination.unlink(missing_ok=True)
+            raise RuntimeError(f"切分结果无法解码: {destination}")
+        progress.update(start, (min(end, total_ms) - start) / 1000, total_ms)
+        return destination
+
     try:
-        for start, destination in zip(starts, destinations, strict=True):
-            check_cancelled(cancel_token)
-            audio[start : start + duration_ms].export(destination, format="mp3", bitrate=bitrate)
-            if not validate_audio(destination, ffmpeg_executable):
-                raise RuntimeError(f"切分结果无法解码: {destination}")
-            outputs.append(destination)
+        with closing(run_concurrently(export_one, range(len(bounds)), workers=workers, cancel_token=cancel_token)) as outcomes:
+            for outcome in outcomes:
+                if outcome.error is not None:
+                    raise outcome.error
     except Exception:
+        # 未开启 overwrite 时目标文件此前都不存在，可以整组回滚；并行任务已在 closing 中等待结束。
         if not overwrite:
-            for path in outputs:
+            for path in destinations:
                 path.unlink(missing_ok=True)
         raise
-    return outputs
+    return list(destinations)
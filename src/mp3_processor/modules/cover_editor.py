@@ -2,28 +2,42 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import io
 import struct
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
+from mutagen import PaddingInfo
 from mutagen.asf import ASF
 from mutagen.asf._attrs import ASFByteArrayAttribute
-from mutagen.id3 import ID3
 from mutagen.id3._frames import APIC
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
 from PIL import Image, ImageDraw, ImageFont
 
+from mp3_processor.modules.files import atomic_output
+from mp3_processor.modules.metadata_editor import open_audio
+
+
+# 按字节上限压缩封面时允许降到的最低 JPEG 质量和最短边像素。
+MIN_COVER_QUALITY = 40
+MIN_COVER_PIXELS = 200
+
 
 def crop_image(source: Path, destination: Path, crop_box: tuple[int, int, int, int]) -> Path:
-    """裁剪图片并保留适合目标扩展名的色彩模式。"""
+    """裁剪图片并保留适合目标扩展名的色彩模式；先写临时文件，成功后原子替换 destination。"""
     if not source.is_file():
         raise FileNotFoundError(f"图片不存在: {source}")
-    destination.parent.mkdir(parents=True, exist_ok=True)
     with Image.open(source) as image:
         cropped = image.crop(crop_box)
         if destination.suffix.lower() in {".jpg", ".jpeg"} and cropped.mode not in {"RGB", "L"}:
             cropped = cropped.convert("RGB")
-        cropped.save(destination)
+        with atomic_output(destination) as temporary:
+            cropped.save(temporary, format=_image_format(destination))
     return destination
 
 
@@ -49,56 +63,194 @@ def render_text(
             width, height = box[2] - box[0], box[3] - box[1]
             draw.text(((canvas.width - width) / 2, y), line, font=font, fill=(*color, 255))
             y += height + line_spacing
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        if destination.suffix.lower() in {".jpg", ".jpeg"}:
-            canvas.convert("RGB").save(destination)
-        else:
-            canvas.save(destination)
+        output = canvas.convert("RGB") if destination.suffix.lower() in {".jpg", ".jpeg"} else canvas
+        with atomic_output(destination) as temporary:
+            output.save(temporary, format=_image_format(destination))
     return destination
 
 
-def embed_cover(audio_path: Path, cover_path: Path, *, replace: bool = True) -> None:
-    """向 MP3、M4A 或 WMA 文件写入封面。"""
-    image_data = cover_path.read_bytes()
-    mime = _image_mime(cover_path)
-    suffix = audio_path.suffix.lower()
-    if suffix == ".mp3":
-        audio = MP3(audio_path, ID3=ID3)
-        if audio.tags is None:
-            audio.add_tags()
+@dataclass(frozen=True)
+class CoverPayload:
+    """一次读取并预先构建好的封面帧；所有帧引用同一份图片字节，可在多个文件和线程间共享。"""
+
+    data: bytes
+    mime: str
+    apic: APIC
+    mp4_cover: MP4Cover
+    asf_picture: ASFByteArrayAttribute
+    digest: bytes = b""
+    source_size: int = 0
+
+    def matches(self, data: bytes) -> bool:
+        """判断已嵌入的图片字节是否与本封面相同；长度不同时不计算哈希。"""
+        return len(data) == len(self.data) and hashlib.sha256(data).digest() == self.digest
+
+
+def load_cover(path: Path, *, max_pixels: int = 0, quality: int = 85, max_bytes: int = 0) -> CoverPayload:
+    """读取封面图片并构建 ID3 APIC、MP4 covr 和 WMA WM/Picture 三种封面帧。
+
+    max_pixels 或 max_bytes 大于 0 时先用 optimize_cover 缩放并重新压缩，见该函数说明。
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"封面图片不存在: {path}")
+    data, mime = path.read_bytes(), image_mime(path)
+    source_size = len(data)
+    if max_pixels > 0 or max_bytes > 0:
+        data, mime = optimize_cover(data, mime, max_pixels=max_pixels, quality=quality, max_bytes=max_bytes)
+    image_format = MP4Cover.FORMAT_PNG if mime == "image/png" else MP4Cover.FORMAT_JPEG
+    picture = (
+        struct.pack("<bi", 3, len(data))
+        + mime.encode("utf-16-le")
+        + b"\x00\x00"
+        + "Cover".encode("utf-16-le")
+        + b"\x00\x00"
+        + data
+    )
+    return CoverPayload(
+        data,
+        mime,
+        APIC(encoding=3, mime=mime, type=3, desc="Cover", data=data),
+        MP4Cover(data, imageformat=image_format),
+        ASFByteArrayAttribute(picture),
+        hashlib.sha256(data).digest(),
+        source_size,
+    )
+
+
+def load_configured_cover(
+    path: Path,
+    options: Mapping[str, Any],
+    *,
+    cover_max_pixels: int | None = None,
+    cover_max_kb: int | None = None,
+) -> CoverPayload:
+    """按 options（flows.apply_cover 配置）中的 cover_max_pixels、cover_max_kb 和 cover_quality 读取封面。
+
+    cover_max_pixels 或 cover_max_kb 不为 None 时覆盖配置值。
+    """
+    max_pixels = int(options.get("cover_max_pixels", 0)) if cover_max_pixels is None else cover_max_pixels
+    max_kb = int(options.get("cover_max_kb", 0)) if cover_max_kb is None else cover_max_kb
+    return load_cover(path, max_pixels=max_pixels, quality=int(options.get("cover_quality", 85)), max_bytes=max_kb * 1024)
+
+
+def optimize_cover(
+    data: bytes,
+    mime: str,
+    *,
+    max_pixels: int = 0,
+    quality: int = 85,
+    max_bytes: int = 0,
+) -> tuple[bytes, str]:
+    """把封面缩放到最长边不超过 max_pixels，并按 quality 重新压缩为 JPEG；返回 (图片字节, MIME)。
+
+    max_bytes 大于 0 时逐步降低质量（不低于 MIN_COVER_QUALITY），仍超出时继续缩小尺寸。
+    原图已满足尺寸和字节限制时原样返回，不做有损重压缩。
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        fits_pixels = max_pixels <= 0 or max(image.size) <= max_pixels
+        if fits_pixels and (max_bytes <= 0 or len(data) <= max_bytes):
+            return data, mime
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if not fits_pixels:
+            image.thumbnail((max_pixels, max_pixels), Image.Resampling.LANCZOS)
+        current_quality = quality
+        encoded = _encode_jpeg(image, current_quality)
+        while max_bytes > 0 and len(encoded) > max_bytes:
+            if current_quality > MIN_COVER_QUALITY:
+                current_quality = max(MIN_COVER_QUALITY, current_quality - 10)
+            elif min(image.size) > MIN_COVER_PIXELS:
+                image = image.resize((max(1, int(image.width * 0.8)), max(1, int(image.height * 0.8))), Image.Resampling.LANCZOS)
+            else:
+                break
+            encoded = _encode_jpeg(image, current_quality)
+    return encoded, "image/jpeg"
+
+
+def embed_cover(
+    audio_path: Path,
+    cover: Path | CoverPayload,
+    *,
+    replace: bool = True,
+    padding: Callable[[PaddingInfo], int] | None = None,
+) -> bool:
+    """向 MP3、M4A 或 WMA 文件写入封面；padding 传给 mutagen 的 save，见 PaddingPolicy。
+
+    批量写入同一封面时先用 load_cover 构建 CoverPayload 再传入，避免每个文件重复读取和构建封面帧。
+    文件已嵌入相同封面时不保存并返回 False。
+    """
+    if audio_path.suffix.lower() not in {".mp3", ".m4a", ".wma"}:
+        raise ValueError(f"不支持写入封面的格式: {audio_path.suffix}")
+    payload = cover if isinstance(cover, CoverPayload) else load_cover(cover)
+    audio = open_audio(audio_path)
+    if not set_cover(audio, payload, replace=replace):
+        return False
+    audio.save(padding=padding)
+    return True
+
+
+def set_cover(audio: MP3 | MP4 | ASF, cover: CoverPayload, *, replace: bool = True) -> bool:
+    """在已打开的 audio 上设置封面，不保存文件；audio 由 metadata_editor.open_audio 打开。
+
+    已嵌入相同图片时不做修改并返回 False：replace 为 True 时要求现有封面恰好只有这一张，
+    否则只要求其中一张相同。
+    """
+    matched = [cover.matches(data) for data in embedded_pictures(audio)]
+    if (replace and matched == [True]) or (not replace and any(matched)):
+        return False
+    if isinstance(audio, MP3):
         tags = audio.tags
         if tags is None:
-            raise RuntimeError(f"无法创建 MP3 ID3 标签: {audio_path}")
+            raise RuntimeError(f"无法创建 MP3 ID3 标签: {audio.filename}")
         if replace:
             tags.delall("APIC")
-        tags.add(APIC(encoding=3, mime=mime, type=3, desc="Cover", data=image_data))
-        audio.save()
-        return
-    if suffix == ".m4a":
-        audio = MP4(audio_path)
-        image_format = MP4Cover.FORMAT_PNG if mime == "image/png" else MP4Cover.FORMAT_JPEG
-        audio["covr"] = [MP4Cover(image_data, imageformat=image_format)]
-        audio.save()
-        return
-    if suffix == ".wma":
-        audio = ASF(audio_path)
-        picture = (
-            struct.pack("<bi", 3, len(image_data))
-            + mime.encode("utf-16-le")
-            + b"\x00\x00"
-            + "Cover".encode("utf-16-le")
-            + b"\x00\x00"
-            + image_data
-        )
-        audio["WM/Picture"] = [ASFByteArrayAttribute(picture)]
-        audio.save()
-        return
-    raise ValueError(f"不支持写入封面的格式: {audio_path.suffix}")
-
-
-def _image_mime(path: Path) -> str:
+            tags.add(cover.apic)
+        else:
+            # 与已有同 HashKey 的封面合并时 mutagen 会在新加入的帧上追加 salt，放入浅拷贝以免改动共享的
+            # CoverPayload.apic 及其 HashKey；图片字节仍然共享。
+            tags.add(copy.copy(cover.apic))
+    elif isinstance(audio, MP4):
+        audio["covr"] = [cover.mp4_cover]
+    elif isinstance(audio, ASF):
+        audio["WM/Picture"] = [cover.asf_picture]
+    return True
+
+
+def embedded_pictures(audio: MP3 | MP4 | ASF) -> list[bytes]:
+    """返回已打开的 audio 中所有嵌入图片（APIC、covr 或 WM/Picture）的图片字节。"""
+    if isinstance(audio, MP3):
+        return [frame.data for frame in audio.tags.getall("APIC")] if audio.tags is not None else []
+    if isinstance(audio, MP4):
+        return list(audio.get("covr", []))
+    if isinstance(audio, ASF):
+        pictures = []
+        for attribute in audio.get("WM/Picture", []):
+            value = attribute.value
+            # WM/Picture 以类型字节和 4 字节长度开头，图片数据位于结构末尾。
+            size = struct.unpack_from("<bi", value)[1] if len(value) >= 5 else 0
+            pictures.append(value[-size:] if 0 < size <= len(value) else b"")
+        return pictures
+    raise ValueError(f"不支持写入封面的音频类型: {type(audio).__name__}")
+
+
+def image_mime(path: Path) -> str:
+    """返回封面图片的 MIME 类型；音频封面仅支持 PNG 或 JPEG。"""
     if path.suffix.lower() == ".png":
         return "image/png"
     if path.suffix.lower() in {".jpg", ".jpeg"}:
         return "image/jpeg"
     raise ValueError("音频封面仅支持 PNG 或 JPEG")
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def _image_format(path: Path) -> str:
+    image_format = Image.registered_extensions().get(path.suffix.lower())
+    if image_format is None:
+        raise ValueError(f"不支持的图片格式: {path.suffix}")
+    return image_format
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
+import os
+import secrets
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from mp3_processor.modules.scan_index import ScanIndex
+
 
 AUDIO_EXTENSIONS = frozenset({".mp3", ".m4a", ".mp4", ".wma"})
 IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp"})
+# 未完成输出的临时文件后缀；不属于任何输入扩展名，扫描时不会被当作源文件。
+TEMP_SUFFIX = ".mp3proc-tmp"
 
 
 def iter_files(
@@ -16,19 +23,100 @@ def iter_files(
     *,
     recursive: bool = True,
     max_depth: int = 0,
+    sort: bool = True,
+    index: Path | None = None,
+    rescan: bool = False,
 ) -> Iterator[Path]:
-    """按路径稳定排序返回指定扩展名的文件；max_depth=0 表示不限制。"""
+    """返回指定扩展名的文件；max_depth=0 表示不限制。
+
+    sort=True 时按路径稳定排序后返回；sort=False 时边扫描边产出，顺序取决于文件系统。
+    超出深度的目录不会被打开，目录项类型直接复用 scandir 的结果。提供 index 时使用该
+    SQLite 扫描索引，只重新列出 mtime 发生变化的目录；rescan=True 强制全量扫描并刷新索引。
+    """
     if not root.is_dir():
         raise NotADirectoryError(f"目录不存在: {root}")
     normalized = {suffix.lower() if suffix.startswith(".") else f".{suffix.lower()}" for suffix in extensions}
-    iterator = root.rglob("*") if recursive else root.glob("*")
-    files = (path for path in iterator if path.is_file() and path.suffix.lower() in normalized)
-    if max_depth > 0:
-        files = (path for path in files if len(path.relative_to(root).parts) - 1 <= max_depth)
-    yield from sorted(files, key=lambda path: str(path).casefold())
+    if not recursive:
+        dir_depth: int | None = 0
+    else:
+        dir_depth = max_depth if max_depth > 0 else None
+    if index is None:
+        yield from _ordered(_scan_files(root, normalized, dir_depth, _list_directory), sort)
+        return
+    with ScanIndex(index) as scan_index:
+
+        def list_indexed(directory: str) -> tuple[list[str], list[str]]:
+            entries = scan_index.list_directory(directory, rescan=rescan)
+            subdirs = [entry.name for entry in entries if entry.is_dir]
+            return subdirs, [entry.name for entry in entries if not entry.is_dir]
+
+        yield from _ordered(_scan_files(root, normalized, dir_depth, list_indexed), sort)
+
+
+def _ordered(files: Iterator[Path], sort: bool) -> Iterator[Path]:
+    return iter(sorted(files, key=lambda path: str(path).casefold())) if sort else files
+
+
+def _scan_files(
+    root: Path,
+    suffixes: set[str],
+    max_dir_depth: int | None,
+    list_directory: Callable[[str], tuple[list[str], list[str]]],
+) -> Iterator[Path]:
+    """深度优先扫描；不跟随目录符号链接，跳过无权限的子目录。"""
+    stack = [(os.fspath(root), 0)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            subdirs, names = list_directory(directory)
+        except PermissionError:
+            if depth == 0:
+                raise
+            continue
+        if max_dir_depth is None or depth < max_dir_depth:
+            stack.extend((os.path.join(directory, name), depth + 1) for name in reversed(subdirs))
+        yield from (Path(directory, name) for name in names if os.path.splitext(name)[1].lower() in suffixes)
+
+
+def _list_directory(directory: str) -> tuple[list[str], list[str]]:
+    subdirs: list[str] = []
+    names: list[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.is_file():
+                names.append(entry.name)
+    return subdirs, names
 
 
 def output_path_for(source: Path, source_root: Path, output_root: Path, suffix: str) -> Path:
     """保留输入目录层级并替换扩展名。"""
     relative = source.relative_to(source_root)
     return (output_root / relative).with_suffix(suffix)
+
+
+@contextmanager
+def atomic_output(destination: Path) -> Iterator[Path]:
+    """提供与 destination 同目录的临时路径，代码块成功结束后原子替换为 destination。
+
+    代码块抛出异常时删除临时文件，destination 保持原样；写入方需按 destination 的扩展名显式指定格式。
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_name(f".{destination.name}.{secrets.token_hex(4)}{TEMP_SUFFIX}")
+    try:
+        yield temporary
+        os.replace(temporary, destination)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def sweep_temp_files(root: Path) -> list[Path]:
+    """删除 root 下由中断运行遗留的临时输出文件，返回已删除的路径。"""
+    if not root.is_dir():
+        return []
+    removed: list[Path] = []
+    for path in _scan_files(root, {TEMP_SUFFIX}, None, _list_directory):
+        path.unlink(missing_ok=True)
+        removed.append(path)
+    return removed
@@ -0,0 +1,150 @@
+"""按源文件指纹和处理参数记录已完成输出的增量处理账本。"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str = ""
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    fingerprint: SourceFingerprint
+    params: str
+    outputs: list[Path]
+
+
+def fingerprint(path: Path, *, with_hash: bool = False) -> SourceFingerprint:
+    """读取源文件大小和修改时间；with_hash=True 时额外计算 SHA-256。"""
+    stat = path.stat()
+    digest = ""
+    if with_hash:
+        hasher = hashlib.sha256()
+        with path.open("rb") as stream:
+            while chunk := stream.read(HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+    return SourceFingerprint(stat.st_size, stat.st_mtime_ns, digest)
+
+
+def encode_params(params: dict[str, object]) -> str:
+    return json.dumps(params, ensure_ascii=False, sort_keys=True)
+
+
+class ProcessingLedger:
+    """以 (源文件, 输出目标) 为键记录指纹、参数和输出列表。
+
+    只有源指纹、处理参数都未变化且记录的输出仍全部存在时，才认为输出是最新的。
+    """
+
+    def __init__(self, path: Path, *, hash_sources: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.hash_sources = hash_sources
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ledger (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                params TEXT NOT NULL,
+                outputs TEXT NOT NULL,
+                PRIMARY KEY (source, target)
+            )
+            """
+        )
+
+    def __enter__(self) -> ProcessingLedger:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+    def lookup(self, source: Path, target: Path) -> LedgerEntry | None:
+        row = self._connection.execute(
+            "SELECT size, mtime_ns, sha256, params, outputs FROM ledger WHERE source = ? AND target = ?",
+            (str(source), str(target)),
+        ).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, sha256, params, outputs = row
+        return LedgerEntry(SourceFingerprint(size, mtime_ns, sha256), params, [Path(item) for item in json.loads(outputs)])
+
+    def is_current(self, source: Path, target: Path, params: dict[str, object]) -> bool:
+        entry = self.lookup(source, target)
+        if entry is None or entry.params != encode_params(params):
+            return False
+        if not entry.outputs or not all(path.exists() for path in entry.outputs):
+            return False
+        stored = entry.fingerprint
+        stat = source.stat()
+        if (stat.st_size, stat.st_mtime_ns) == (stored.size, stored.mtime_ns):
+            return True
+        # 只有大小相同、仅时间戳变化（如同步工具重写 mtime）时才计算哈希；哈希一致仍视为最新，
+        # 并更新记录中的时间戳，之后的运行无需再次读取整个文件。
+        if not (self.hash_sources and stored.sha256 and stat.st_size == stored.size):
+            return False
+        current = fingerprint(source, with_hash=True)
+        if current.sha256 != stored.sha256:
+            return False
+        with self._connection:
+            self._connection.execute(
+                "UPDATE ledger SET size = ?, mtime_ns = ? WHERE source = ? AND target = ?",
+                (current.size, current.mtime_ns, str(source), str(target)),
+            )
+        return True
+
+    def adopt(self, source: Path, target: Path, params: dict[str, object], outputs: list[Path]) -> bool:
+        """为启用账本前已生成的输出补录记录，返回是否补录。
+
+        只有该目标尚无记录，且 outputs 全部存在、修改时间都不早于源文件时才按当前 params 记录；
+        已有记录的目标仍由 is_current 判断。
+        """
+        if not outputs or self.lookup(source, target) is not None:
+            return False
+        source_mtime = source.stat().st_mtime_ns
+        if not all(path.exists() and path.stat().st_mtime_ns >= source_mtime for path in outputs):
+            return False
+        self.record(source, target, params, outputs)
+        return True
+
+    def record(self, source: Path, target: Path, params: dict[str, object], outputs: list[Path]) -> None:
+        current = fingerprint(source, with_hash=self.hash_sources)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO ledger (source, target, size, mtime_ns, sha256, params, outputs) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(source),
+                    str(target),
+                    current.size,
+                    current.mtime_ns,
+                    current.sha256,
+                    encode_params(params),
+                    json.dumps([str(path) for path in outputs], ensure_ascii=False),
+                ),
+            )
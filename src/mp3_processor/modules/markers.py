@@ -0,0 +1,115 @@
+"""读取章节与 CUE 标记，用于按内容结构无损切分。"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import mutagen
+from mutagen.id3 import ID3
+from mutagen.mp4 import MP4
+
+
+# CUE 时间以 1/75 秒为帧单位。
+CUE_FRAMES_PER_SECOND = 75
+CUE_ENCODINGS = ("utf-8-sig", "gb18030")
+MAX_TITLE_LENGTH = 80
+
+_INDEX_PATTERN = re.compile(r"^INDEX\s+01\s+(\d+):(\d{1,2}):(\d{1,2})\s*$", re.IGNORECASE)
+_TITLE_PATTERN = re.compile(r'^TITLE\s+"?(.*?)"?\s*$', re.IGNORECASE)
+_UNSAFE_CHARACTERS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+@dataclass(frozen=True)
+class Marker:
+    start_seconds: float
+    title: str = ""
+
+
+def read_markers(source: Path) -> list[Marker]:
+    """优先读取同名 `.cue` 文件，否则读取 M4A 章节（chpl）或 ID3 CHAP 帧。
+
+    结果按开始时间排序，并丢弃与前一个标记开始时间相同的标记。
+    """
+    cue = source.with_suffix(".cue")
+    if cue.is_file():
+        markers = parse_cue(cue)
+    elif source.suffix.lower() in {".m4a", ".m4b", ".mp4"}:
+        markers = _mp4_chapters(source)
+    elif source.suffix.lower() == ".mp3":
+        markers = _id3_chapters(source)
+    else:
+        markers = []
+    unique: list[Marker] = []
+    for marker in sorted(markers, key=lambda item: item.start_seconds):
+        if not unique or marker.start_seconds > unique[-1].start_seconds:
+            unique.append(marker)
+    return unique
+
+
+def parse_cue(path: Path) -> list[Marker]:
+    """解析 CUE 文件中每个 TRACK 的 TITLE 和 INDEX 01。"""
+    markers: list[Marker] = []
+    title = ""
+    in_track = False
+    for raw_line in _read_text(path).splitlines():
+        line = raw_line.strip()
+        keyword = line.split(maxsplit=1)[0].upper() if line else ""
+        if keyword == "TRACK":
+            in_track, title = True, ""
+        elif keyword == "TITLE" and in_track:
+            match = _TITLE_PATTERN.match(line)
+            title = match.group(1) if match else ""
+        elif keyword == "INDEX" and in_track:
+            match = _INDEX_PATTERN.match(line)
+            if match:
+                minutes, seconds, frames = (int(value) for value in match.groups())
+                markers.append(Marker(minutes * 60 + seconds + frames / CUE_FRAMES_PER_SECOND, title))
+    return markers
+
+
+def marker_paths(source: Path, output_dir: Path, markers: list[Marker]) -> list[Path]:
+    """返回 `<stem>_NN_<标题>.<源扩展名>` 形式的输出路径；没有标题时使用 `<stem>_part_NN`。"""
+    digits = max(2, len(str(len(markers))))
+    paths: list[Path] = []
+    for index, marker in enumerate(markers, start=1):
+        title = _safe_title(marker.title)
+        name = f"{source.stem}_{index:0{digits}d}_{title}" if title else f"{source.stem}_part_{index:0{digits}d}"
+        paths.append(output_dir / f"{name}{source.suffix.lower()}")
+    return paths
+
+
+def _mp4_chapters(source: Path) -> list[Marker]:
+    try:
+        chapters = MP4(source).chapters
+    except (mutagen.MutagenError, OSError):
+        return []
+    return [Marker(float(chapter.start), chapter.title or "") for chapter in chapters or []]
+
+
+def _id3_chapters(source: Path) -> list[Marker]:
+    try:
+        tags = ID3(source)
+    except (mutagen.MutagenError, OSError):
+        return []
+    markers: list[Marker] = []
+    for frame in tags.getall("CHAP"):
+        title = frame.sub_frames.get("TIT2")
+        markers.append(Marker(frame.start_time / 1000, str(title.text[0]) if title and title.text else ""))
+    return markers
+
+
+def _read_text(path: Path) -> str:
+    data = path.read_bytes()
+    for encoding in CUE_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
+
+
+def _safe_title(title: str) -> str:
+    cleaned = _UNSAFE_CHARACTERS.sub("_", title).strip(" .")
+    return cleaned[:MAX_TITLE_LENGTH].rstrip(" .")
@@ -0,0 +1,136 @@
+"""基于 mutagen 文件头解析的媒体信息探测与缓存。"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from types import TracebackType
+
+import mutagen
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration_seconds: float
+    bitrate: int = 0
+    codec: str = ""
+    sample_rate: int = 0
+    channels: int = 0
+
+
+# 进程内缓存，键为 (路径, 大小, mtime_ns)；文件变化后键随之变化，旧结果自然失效。
+_MEMO: dict[tuple[str, int, int], MediaInfo | None] = {}
+
+
+def probe_media(path: Path) -> MediaInfo | None:
+    """读取容器头部的时长、码率、编码和声道信息，不解码音频；无法识别时返回 None。"""
+    key = _memo_key(path)
+    if key is None:
+        return None
+    if key not in _MEMO:
+        _MEMO[key] = _read_header(path)
+    return _MEMO[key]
+
+
+def probe_many(paths: Iterable[Path], *, cache: Path | None = None) -> dict[Path, MediaInfo | None]:
+    """批量探测媒体信息；提供 cache 时复用并更新该 SQLite 缓存中大小和 mtime 未变的结果。"""
+    items = list(paths)
+    if cache is None:
+        return {path: probe_media(path) for path in items}
+    with MediaProbeCache(cache) as probe_cache:
+        return {path: probe_cache.probe(path) for path in items}
+
+
+class MediaProbeCache:
+    """以 (路径, 大小, mtime_ns) 为键持久化探测结果，重复运行时无需再次解析文件头。"""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS media (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                duration_seconds REAL,
+                bitrate INTEGER NOT NULL,
+                codec TEXT NOT NULL,
+                sample_rate INTEGER NOT NULL,
+                channels INTEGER NOT NULL
+            )
+            """
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> MediaProbeCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+    def probe(self, path: Path) -> MediaInfo | None:
+        key = _memo_key(path)
+        if key is None:
+            return None
+        if key in _MEMO:
+            self.hits += 1
+            return _MEMO[key]
+        row = self._connection.execute(
+            "SELECT size, mtime_ns, duration_seconds, bitrate, codec, sample_rate, channels FROM media WHERE path = ?",
+            (key[0],),
+        ).fetchone()
+        if row is not None and (row[0], row[1]) == key[1:]:
+            self.hits += 1
+            info = None if row[2] is None else MediaInfo(*row[2:])
+        else:
+            self.misses += 1
+            info = _read_header(path)
+            values = astuple(info) if info is not None else (None, 0, "", 0, 0)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO media "
+                "(path, size, mtime_ns, duration_seconds, bitrate, codec, sample_rate, channels) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, *values),
+            )
+        _MEMO[key] = info
+        return info
+
+
+def _memo_key(path: Path) -> tuple[str, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+def _read_header(path: Path) -> MediaInfo | None:
+    try:
+        audio = mutagen.File(path)
+    except (mutagen.MutagenError, OSError):
+        return None
+    info = getattr(audio, "info", None)
+    length = getattr(info, "length", None)
+    if audio is None or not length:
+        return None
+    codec = getattr(info, "codec", "") or getattr(info, "codec_name", "") or type(audio).__name__
+    return MediaInfo(
+        float(length),
+        int(getattr(info, "bitrate", 0) or 0),
+        str(codec).lower(),
+        int(getattr(info, "sample_rate", 0) or 0),
+        int(getattr(info, "channels", 0) or 0),
+    )
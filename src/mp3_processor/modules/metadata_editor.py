@@ -1,16 +1,23 @@
-"""MP3 与 M4A 元数据读写能力。"""
+"""MP3、M4A 与 WMA 元数据读写能力。"""
 
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from pathlib import Path
 
-from mutagen.easyid3 import EasyID3
+from mutagen import PaddingInfo
+from mutagen.asf import ASF
+from mutagen.id3 import ID3
+from mutagen.id3._frames import TALB, TIT2, TPE1
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4
 
 
 LEADING_EPISODE_ZERO = re.compile(r"(第)0+(\d+)(集)")
+ID3_TEXT_FRAMES = {"title": TIT2, "artist": TPE1, "album": TALB}
+MP4_TEXT_KEYS = {"title": "\xa9nam", "artist": "\xa9ART", "album": "\xa9alb"}
+ASF_TEXT_KEYS = {"title": "Title", "artist": "Author", "album": "WM/AlbumTitle"}
 
 
 def title_from_filename(path: Path) -> str:
@@ -24,33 +31,62 @@ def update_audio_tags(
     artist: str | None = None,
     album: str | None = None,
     title: str | None = None,
-) -> None:
-    """更新一个 MP3 或 M4A 文件的常用标签。"""
-    title = title or title_from_filename(path)
+    padding: Callable[[PaddingInfo], int] | None = None,
+) -> bool:
+    """更新一个 MP3 或 M4A 文件的常用标签；现有标签已与目标一致时不写文件并返回 False。
+
+    padding 传给 mutagen 的 save，用于决定标签区预留的空白空间，见 PaddingPolicy。
+    """
+    if path.suffix.lower() not in {".mp3", ".m4a"}:
+        raise ValueError(f"不支持写入元数据的格式: {path.suffix}")
+    audio = open_audio(path)
+    if not set_text_tags(audio, title=title or title_from_filename(path), artist=artist, album=album):
+        return False
+    audio.save(padding=padding)
+    return True
+
+
+def open_audio(path: Path) -> MP3 | MP4 | ASF:
+    """打开 MP3、M4A 或 WMA 文件供修改标签和封面；MP3 使用完整 ID3 帧，没有标签时创建空标签。"""
     suffix = path.suffix.lower()
     if suffix == ".mp3":
-        audio = MP3(path, ID3=EasyID3)
+        audio = MP3(path, ID3=ID3)
         if audio.tags is None:
             audio.add_tags()
-        audio["title"] = title
-        if artist:
-            audio["artist"] = artist
-        if album:
-            audio["album"] = album
-        audio.save()
-        return
+        return audio
     if suffix == ".m4a":
-        audio = MP4(path)
-        audio["\xa9nam"] = [title]
-        if artist:
-            audio["\xa9ART"] = [artist]
-        if album:
-            audio["\xa9alb"] = [album]
-        audio.save()
-        return
+        return MP4(path)
+    if suffix == ".wma":
+        return ASF(path)
     raise ValueError(f"不支持写入元数据的格式: {path.suffix}")
 
 
+def set_text_tags(audio: MP3 | MP4 | ASF, *, title: str | None, artist: str | None, album: str | None) -> bool:
+    """在已打开的 audio 上设置非空的标题、艺术家和专辑，不保存文件；返回是否有标签发生变化。"""
+    wanted = {name: value for name, value in (("title", title), ("artist", artist), ("album", album)) if value}
+    if isinstance(audio, MP3):
+        tags = audio.tags
+        if tags is None:
+            raise RuntimeError(f"MP3 尚未创建 ID3 标签: {audio.filename}")
+        changed = False
+        for name, value in wanted.items():
+            frame_type = ID3_TEXT_FRAMES[name]
+            frame = tags.get(frame_type.__name__)
+            if frame is None or [str(text) for text in frame.text] != [value]:
+                tags.setall(frame_type.__name__, [frame_type(encoding=3, text=[value])])
+                changed = True
+        return changed
+    keys = MP4_TEXT_KEYS if isinstance(audio, MP4) else ASF_TEXT_KEYS
+    changes = {
+        keys[name]: value
+        for name, value in wanted.items()
+        if [str(existing) for existing in audio.get(keys[name], [])] != [value]
+    }
+    for key, value in changes.items():
+        audio[key] = [value]
+    return bool(changes)
+
+
 def album_for_file(path: Path, root: Path, base_album: str | None, include_folder: bool) -> str | None:
     """根据配置组合基础专辑名和文件所在目录名。"""
     if not include_folder:
@@ -0,0 +1,38 @@
+"""标签保存时的 padding 策略与写入方式统计。"""
+
+from __future__ import annotations
+
+from threading import Lock
+
+from mutagen import PaddingInfo
+
+
+# 首次需要扩大标签区时预留的空白空间，足以容纳后续标题修改和常见尺寸的封面替换。
+DEFAULT_RESERVE_BYTES = 256 * 1024
+
+
+class PaddingPolicy:
+    """作为 mutagen `save(padding=...)` 的回调，并统计原地写入与整文件重写的次数。
+
+    现有 padding 足以容纳新标签时原样保留，只改写文件头部；不足时整文件重写一次并预留
+    reserve_bytes，使之后的标签和封面修改可以原地完成。padding 超过 max_bytes 时才收缩。
+    """
+
+    def __init__(self, reserve_bytes: int = DEFAULT_RESERVE_BYTES, max_bytes: int | None = None) -> None:
+        self.reserve_bytes = reserve_bytes
+        self.max_bytes = reserve_bytes * 8 if max_bytes is None else max_bytes
+        self.in_place = 0
+        self.rewrites = 0
+        self._lock = Lock()
+
+    def __call__(self, info: PaddingInfo) -> int:
+        if 0 <= info.padding <= self.max_bytes:
+            with self._lock:
+                self.in_place += 1
+            return info.padding
+        with self._lock:
+            self.rewrites += 1
+        return self.reserve_bytes
+
+    def stats(self) -> dict[str, int]:
+        return {"in_place_writes": self.in_place, "full_rewrites": self.rewrites}
@@ -0,0 +1,130 @@
+"""基于 SQLite 的增量目录扫描索引。"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+
+# 目录 mtime 距扫描时刻过近时不记录，避免粗粒度时间戳（如 SMB、FAT）漏掉同一秒内的变化。
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    name: str
+    is_dir: bool
+    size: int = 0
+    mtime_ns: int = 0
+
+
+class ScanIndex:
+    """按目录保存 mtime 和目录项；目录 mtime 未变化时直接复用上次的列表。
+
+    目录 mtime 只反映直接子项的增删和重命名，因此未变化的目录不必重新列出，
+    但仍会逐层检查子目录自身的 mtime。
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                directory TEXT NOT NULL,
+                name TEXT NOT NULL,
+                is_dir INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (directory, name)
+            );
+            """
+        )
+        self.reused = 0
+        self.scanned = 0
+
+    def __enter__(self) -> ScanIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+    def list_directory(self, directory: str, *, rescan: bool = False) -> list[DirectoryEntry]:
+        """返回目录的直接子项；rescan=True 时忽略索引重新列出。"""
+        mtime_ns = os.stat(directory).st_mtime_ns
+        if not rescan:
+            row = self._connection.execute("SELECT mtime_ns FROM directories WHERE path = ?", (directory,)).fetchone()
+            if row is not None and row[0] == mtime_ns:
+                self.reused += 1
+                return [
+                    DirectoryEntry(name, bool(is_dir), size, entry_mtime)
+                    for name, is_dir, size, entry_mtime in self._connection.execute(
+                        "SELECT name, is_dir, size, mtime_ns FROM entries WHERE directory = ?",
+                        (directory,),
+                    )
+                ]
+        entries = _read_directory(directory)
+        self._store(directory, mtime_ns, entries)
+        self.scanned += 1
+        return entries
+
+    def _store(self, directory: str, mtime_ns: int, entries: list[DirectoryEntry]) -> None:
+        current = {entry.name for entry in entries if entry.is_dir}
+        removed = [
+            name
+            for (name,) in self._connection.execute(
+                "SELECT name FROM entries WHERE directory = ? AND is_dir = 1",
+                (directory,),
+            )
+            if name not in current
+        ]
+        with self._connection:
+            for name in removed:
+                self._forget_tree(os.path.join(directory, name))
+            self._connection.execute("DELETE FROM entries WHERE directory = ?", (directory,))
+            self._connection.executemany(
+                "INSERT INTO entries (directory, name, is_dir, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                [(directory, entry.name, int(entry.is_dir), entry.size, entry.mtime_ns) for entry in entries],
+            )
+            stored_mtime = mtime_ns if time.time_ns() - mtime_ns > RACY_WINDOW_NS else None
+            self._connection.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns) VALUES (?, ?)",
+                (directory, stored_mtime),
+            )
+
+    def _forget_tree(self, directory: str) -> None:
+        prefix = directory + os.sep
+        for table, column in (("directories", "path"), ("entries", "directory")):
+            self._connection.execute(
+                f"DELETE FROM {table} WHERE {column} = ? OR substr({column}, 1, ?) = ?",
+                (directory, len(prefix), prefix),
+            )
+
+
+def _read_directory(directory: str) -> list[DirectoryEntry]:
+    entries: list[DirectoryEntry] = []
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            if entry.is_dir(follow_symlinks=False):
+                entries.append(DirectoryEntry(entry.name, True))
+            elif entry.is_file():
+                stat = entry.stat()
+                entries.append(DirectoryEntry(entry.name, False, stat.st_size, stat.st_mtime_ns))
+    return entries
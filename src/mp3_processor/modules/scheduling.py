@@ -0,0 +1,51 @@
+"""批处理任务排序：按估算时长最长优先分配，缩短并行批次的总耗时。"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from mp3_processor.modules.audio_converter import probe_duration
+
+
+SCHEDULES = ("path", "longest_first")
+# 无法从文件头读取时长时，按 128 kbit/s 从文件大小估算。
+FALLBACK_BYTES_PER_SECOND = 16_000
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SchedulePlan(Generic[T]):
+    """执行顺序及估算：makespan_seconds 为负载最重的工作线程需要处理的媒体时长。"""
+
+    items: list[T]
+    makespan_seconds: float
+    total_seconds: float
+
+
+def estimate_seconds(path: Path) -> float:
+    """读取文件头中的媒体时长，读取失败时按文件大小估算。"""
+    seconds = probe_duration(path)
+    if seconds:
+        return seconds
+    try:
+        return path.stat().st_size / FALLBACK_BYTES_PER_SECOND
+    except OSError:
+        return 0.0
+
+
+def plan_longest_first(items: Sequence[T], weight: Callable[[T], float], *, workers: int) -> SchedulePlan[T]:
+    """按权重从大到小排列任务，并模拟 workers 个工作线程依次领取任务来估算总耗时。
+
+    权重相同的任务保持原有顺序。
+    """
+    weights = [weight(item) for item in items]
+    order = sorted(range(len(items)), key=lambda index: -weights[index])
+    loads = [0.0] * max(1, workers)
+    for index in order:
+        heapq.heapreplace(loads, loads[0] + weights[index])
+    return SchedulePlan([items[index] for index in order], max(loads), sum(weights))
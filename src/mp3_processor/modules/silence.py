@@ -0,0 +1,75 @@
+"""在切分点附近寻找静音位置，避免在语句中间切断。"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from pydub import AudioSegment
+
+from mp3_processor.modules.audio_converter import require_ffmpeg
+
+
+# 能量分析使用的块长度与采样参数；8 kHz 单声道足以区分语音与停顿，每秒仅 16 KB。
+CHUNK_MS = 50
+ANALYSIS_FRAME_RATE = 8000
+
+
+def find_quiet_point(window: AudioSegment, target_ms: int, *, threshold_dbfs: float = -40.0) -> int:
+    """返回窗口内离 target_ms 最近的静音块中心（相对窗口起点的毫秒）。
+
+    按 CHUNK_MS 计算每块的 RMS 电平；没有低于 threshold_dbfs 的块时退回整个窗口中最安静的块。
+    """
+    mono = window.set_channels(1)
+    chunks = [(start, mono[start : start + CHUNK_MS].dBFS) for start in range(0, len(mono) - CHUNK_MS + 1, CHUNK_MS)]
+    if not chunks:
+        return target_ms
+    silent = [start for start, level in chunks if level <= threshold_dbfs]
+    if silent:
+        start = min(silent, key=lambda value: abs(value + CHUNK_MS // 2 - target_ms))
+    else:
+        start = min(chunks, key=lambda chunk: (chunk[1], abs(chunk[0] + CHUNK_MS // 2 - target_ms)))[0]
+    return start + CHUNK_MS // 2
+
+
+def read_analysis_window(
+    source: Path,
+    start_ms: int,
+    duration_ms: int,
+    *,
+    ffmpeg_executable: str = "ffmpeg",
+    timeout_seconds: float | None = 60.0,
+) -> AudioSegment | None:
+    """用 FFmpeg 只解码源文件中的一小段，输出 8 kHz 单声道 PCM；失败或超时返回 None。
+
+    内存占用只与窗口长度有关，与整个文件的时长无关。
+    """
+    command = [
+        require_ffmpeg(ffmpeg_executable),
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{start_ms / 1000:.3f}",
+        "-t",
+        f"{duration_ms / 1000:.3f}",
+        "-i",
+        str(source),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(ANALYSIS_FRAME_RATE),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, timeout=timeout_seconds)
+    except subprocess.TimeoutExpired:
+        return None
+    if completed.returncode != 0 or not completed.stdout:
+        return None
+    data = completed.stdout[: len(completed.stdout) // 2 * 2]
+    return AudioSegment(data=data, sample_width=2, frame_rate=ANALYSIS_FRAME_RATE, channels=1)
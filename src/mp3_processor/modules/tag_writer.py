@@ -0,0 +1,55 @@
+"""一次打开、一次保存地同时写入文本标签和封面。"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from mutagen import PaddingInfo
+
+from mp3_processor.modules.cover_editor import CoverPayload, set_cover
+from mp3_processor.modules.metadata_editor import open_audio, set_text_tags, title_from_filename
+
+
+@dataclass(frozen=True)
+class TagJob:
+    """批量写标签时的单个任务；index 为文件在发现顺序中的位置，用于按原顺序汇总结果。"""
+
+    index: int
+    source: Path
+    album: str | None
+
+
+@dataclass(frozen=True)
+class TagWriteResult:
+    tags_changed: bool
+    cover_changed: bool
+
+    @property
+    def saved(self) -> bool:
+        return self.tags_changed or self.cover_changed
+
+
+def write_tags_and_cover(
+    path: Path,
+    *,
+    artist: str | None = None,
+    album: str | None = None,
+    title: str | None = None,
+    cover: CoverPayload | None = None,
+    replace_cover: bool = True,
+    padding: Callable[[PaddingInfo], int] | None = None,
+) -> TagWriteResult:
+    """在一次解析和一次保存中更新 MP3/M4A/WMA 的标题、艺术家、专辑和封面。
+
+    cover 由 cover_editor.load_cover 预先构建，批量写入时所有文件共享同一份。标签与目标一致且未提供
+    cover 或已嵌入相同封面时不写文件；标签和封面是否变化分别记录在返回结果中。
+    """
+    audio = open_audio(path)
+    tags_changed = set_text_tags(audio, title=title or title_from_filename(path), artist=artist, album=album)
+    cover_changed = cover is not None and set_cover(audio, cover, replace=replace_cover)
+    result = TagWriteResult(tags_changed, cover_changed)
+    if result.saved:
+        audio.save(padding=padding)
+    return result
@@ -11,9 +11,11 @@ class FlowResult:
     discovered: int = 0
     succeeded: int = 0
     skipped: int = 0
+    unchanged: int = 0
     failed: int = 0
     outputs: list[Path] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
+    stats: dict[str, int] = field(default_factory=dict)
 
     @property
     def ok(self) -> bool:
@@ -24,7 +26,9 @@ class FlowResult:
             "discovered": self.discovered,
             "succeeded": self.succeeded,
             "skipped": self.skipped,
+            "unchanged": self.unchanged,
             "failed": self.failed,
             "outputs": [str(path) for path in self.outputs],
             "errors": self.errors,
+            "stats": self.stats,
         }
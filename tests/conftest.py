@@ -0,0 +1,18 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, no padding: 417 字节一帧。
+MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+@pytest.fixture
+def mp3_file() -> Callable[..., Path]:
+    """返回写入最小合法 MP3 帧序列的工厂函数，默认 20 帧（约 0.5 秒）。"""
+
+    def write(path: Path, *, frames: int = 20) -> Path:
+        path.write_bytes(MP3_FRAME * frames)
+        return path
+
+    return write
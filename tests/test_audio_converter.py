@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from threading import Timer
+from time import monotonic
+
+import pytest
+
+from mp3_processor.execution import CancellationToken, TaskCancelled
+from mp3_processor.modules import audio_converter
+from mp3_processor.modules.audio_converter import AudioTimeoutError, EncodeProgress, verify_mp3, watchdog_timeout
+from mp3_processor.modules.files import TEMP_SUFFIX
+
+
+def test_verify_mp3_accepts_frames_and_rejects_garbage(tmp_path: Path, mp3_file) -> None:
+    valid = tmp_path / "valid.mp3"
+    mp3_file(valid)
+    empty = tmp_path / "empty.mp3"
+    empty.write_bytes(b"")
+    garbage = tmp_path / "garbage.mp3"
+    garbage.write_bytes(b"not audio" * 100)
+
+    assert verify_mp3(valid)
+    assert not verify_mp3(empty)
+    assert not verify_mp3(garbage)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="使用 POSIX shell 脚本模拟 FFmpeg")
+def test_convert_reports_ffmpeg_progress(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "long.m4a"
+    source.write_bytes(b"audio")
+    script = tmp_path / "fake-ffmpeg"
+    script.write_text(
+        "#!/bin/sh\n"
+        "printf 'out_time_us=30000000\\nspeed=40.5x\\nprogress=continue\\n'\n"
+        "printf 'out_time_us=60000000\\nspeed=41x\\nprogress=end\\n'\n"
+        'for last; do :; done\nprintf mp3 > "$last"\n',
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    events: list[EncodeProgress] = []
+    monkeypatch.setattr(audio_converter, "probe_duration", lambda path: 120.0)
+
+    audio_converter.convert_to_mp3(source, tmp_path / "long.mp3", ffmpeg_executable=str(script), on_progress=events.append)
+
+    assert [(event.fraction, event.speed) for event in events] == [(0.25, "40.5x"), (0.5, "41x")]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="使用 POSIX shell 脚本模拟 FFmpeg")
+def test_cancel_terminates_running_ffmpeg_and_removes_partial_output(tmp_path: Path) -> None:
+    source = tmp_path / "long.m4a"
+    source.write_bytes(b"audio")
+    destination = tmp_path / "long.mp3"
+    script = tmp_path / "fake-ffmpeg"
+    script.write_text('#!/bin/sh\nfor last; do :; done\nprintf partial > "$last"\nexec sleep 30\n', encoding="utf-8")
+    script.chmod(0o755)
+    token = CancellationToken()
+    Timer(0.3, token.cancel).start()
+    started = monotonic()
+
+    with pytest.raises(TaskCancelled):
+        audio_converter.convert_to_mp3(source, destination, ffmpeg_executable=str(script), cancel_token=token)
+
+    assert monotonic() - started < 5
+    assert not destination.exists()
+    assert not list(tmp_path.glob(f"*{TEMP_SUFFIX}"))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="使用 POSIX shell 脚本模拟 FFmpeg")
+def test_watchdog_kills_hung_ffmpeg_and_removes_partial_output(tmp_path: Path) -> None:
+    source = tmp_path / "broken.wma"
+    source.write_bytes(b"audio")
+    destination = tmp_path / "broken.mp3"
+    script = tmp_path / "fake-ffmpeg"
+    script.write_text('#!/bin/sh\nfor last; do :; done\nprintf partial > "$last"\nexec sleep 30\n', encoding="utf-8")
+    script.chmod(0o755)
+    started = monotonic()
+
+    with pytest.raises(AudioTimeoutError):
+        audio_converter.convert_to_mp3(source, destination, ffmpeg_executable=str(script), timeout_seconds=0.3)
+
+    assert monotonic() - started < 5
+    assert not destination.exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="使用 POSIX shell 脚本模拟 FFmpeg")
+@pytest.mark.parametrize("hang", [False, True])
+def test_watchdog_resets_on_progress_and_kills_stalled_ffmpeg(tmp_path: Path, hang: bool) -> None:
+    source = tmp_path / "slow.m4a"
+    source.write_bytes(b"audio")
+    destination = tmp_path / "slow.mp3"
+    script = tmp_path / "fake-ffmpeg"
+    # 约 1 秒内持续报告进度，总耗时超过 0.5 秒的超时；hang 时随后停止输出并挂起。
+    script.write_text(
+        "#!/bin/sh\n"
+        "for us in 1000000 2000000 3000000 4000000 5000000; do\n"
+        "  printf 'out_time_us=%s\\nprogress=continue\\n' \"$us\"\n"
+        "  sleep 0.2\n"
+        "done\n"
+        'for last; do :; done\nprintf mp3 > "$last"\n'
+        + ("exec sleep 30\n" if hang else ""),
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    started = monotonic()
+
+    if hang:
+        with pytest.raises(AudioTimeoutError):
+            audio_converter.convert_to_mp3(source, destination, ffmpeg_executable=str(script), timeout_seconds=0.5)
+        assert not destination.exists()
+    else:
+        audio_converter.convert_to_mp3(source, destination, ffmpeg_executable=str(script), timeout_seconds=0.5)
+        assert destination.read_bytes() == b"mp3"
+    assert monotonic() - started < 5
+
+
+def test_watchdog_timeout_scales_with_duration() -> None:
+    assert watchdog_timeout(600.0, base_seconds=60, factor=0.5) == 360
+    assert watchdog_timeout(None, base_seconds=60, factor=0.5) == 60
+    assert watchdog_timeout(600.0, base_seconds=0, factor=0.5) is None
@@ -1,6 +1,9 @@
 from pathlib import Path
 
+import pytest
+
 from mp3_processor.modules import audio_splitter
+from mp3_processor.modules.markers import Marker
 
 
 def test_split_audio_uses_configured_ffmpeg(tmp_path: Path, monkeypatch) -> None:
@@ -33,3 +36,253 @@ def test_split_audio_uses_configured_ffmpeg(tmp_path: Path, monkeypatch) -> None
     assert outputs == []
     assert FakeSegment.converter == str(converter)
     assert calls == [source]
+
+
+def test_stream_mode_seeks_each_segment_without_decoding(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.mp3"
+    source.write_bytes(b"audio")
+    calls: list[tuple[str, float, float | None]] = []
+
+    def fake_convert(src: Path, destination: Path, **kwargs) -> Path:
+        calls.append((destination.name, kwargs["start_seconds"], kwargs["duration_seconds"]))
+        destination.write_bytes(b"mp3")
+        return destination
+
+    def fail_decode(path: Path) -> None:
+        raise AssertionError("stream 模式不应整段解码")
+
+    monkeypatch.setattr(audio_splitter.AudioSegment, "from_file", fail_decode)
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+
+    outputs = audio_splitter.split_audio(source, tmp_path / "output", duration_minutes=1, mode="stream")
+
+    assert [path.name for path in outputs] == ["book_part_01.mp3", "book_part_02.mp3", "book_part_03.mp3"]
+    assert calls == [
+        ("book_part_01.mp3", 0.0, 60.0),
+        ("book_part_02.mp3", 60.0, 60.0),
+        ("book_part_03.mp3", 120.0, None),
+    ]
+
+
+def test_copy_mode_only_stream_copies_mp3_sources(tmp_path: Path, monkeypatch) -> None:
+    copies: dict[str, bool] = {}
+
+    def fake_convert(src: Path, destination: Path, **kwargs) -> Path:
+        copies[src.name] = kwargs["copy_stream"]
+        destination.write_bytes(b"mp3")
+        return destination
+
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 30.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+    for name in ("lecture.mp3", "lecture.m4a"):
+        source = tmp_path / name
+        source.write_bytes(b"audio")
+        audio_splitter.split_audio(source, tmp_path / source.suffix[1:], duration_minutes=1, mode="copy")
+
+    assert copies == {"lecture.mp3": True, "lecture.m4a": False}
+
+
+def test_existing_outputs_are_skipped_before_decoding(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    for index in range(1, 4):
+        (output_dir / f"book_part_0{index}.mp3").write_bytes(b"mp3")
+
+    def fail_decode(path: Path) -> None:
+        raise AssertionError("已有输出时不应解码")
+
+    monkeypatch.setattr(audio_splitter.AudioSegment, "from_file", fail_decode)
+    monkeypatch.setattr(audio_splitter, "require_ffmpeg", lambda value: value)
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+
+    with pytest.raises(FileExistsError):
+        audio_splitter.split_audio(source, output_dir, duration_minutes=1)
+
+
+def test_partial_segment_set_survives_without_overwrite(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "book_part_01.mp3").write_bytes(b"existing")
+
+    def fail_convert(src: Path, destination: Path, **kwargs) -> Path:
+        raise AssertionError("已有分段时不应重新编码")
+
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fail_convert)
+
+    with pytest.raises(FileExistsError):
+        audio_splitter.split_audio(source, output_dir, duration_minutes=1, mode="stream")
+    assert [path.name for path in output_dir.iterdir()] == ["book_part_01.mp3"]
+    assert (output_dir / "book_part_01.mp3").read_bytes() == b"existing"
+
+
+def test_decode_mode_keeps_complete_set_when_header_overestimates(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    for index in (1, 2):
+        (output_dir / f"book_part_0{index}.mp3").write_bytes(b"mp3")
+
+    class FakeSegment:
+        converter = ""
+
+        @classmethod
+        def from_file(cls, path: Path):
+            return cls()
+
+        def __len__(self) -> int:
+            return 119_000
+
+    monkeypatch.setattr(audio_splitter, "AudioSegment", FakeSegment)
+    monkeypatch.setattr(audio_splitter, "require_ffmpeg", lambda value: value)
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+
+    with pytest.raises(FileExistsError):
+        audio_splitter.split_audio(source, output_dir, duration_minutes=1)
+    assert sorted(path.name for path in output_dir.iterdir()) == ["book_part_01.mp3", "book_part_02.mp3"]
+
+
+def test_parallel_segments_keep_order_and_roll_back_on_failure(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "output"
+
+    def fake_convert(src: Path, destination: Path, **kwargs) -> Path:
+        if kwargs["start_seconds"] == 120.0 and fail:
+            raise RuntimeError("encode failed")
+        destination.write_bytes(b"mp3")
+        return destination
+
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 240.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+
+    fail = True
+    with pytest.raises(RuntimeError, match="encode failed"):
+        audio_splitter.split_audio(source, output_dir, duration_minutes=1, mode="stream", workers=3)
+    assert not list(output_dir.iterdir())
+
+    fail = False
+    outputs = audio_splitter.split_audio(source, output_dir, duration_minutes=1, mode="stream", workers=3)
+    assert [path.name for path in outputs] == [f"book_part_0{index}.mp3" for index in range(1, 5)]
+
+
+def test_cuts_move_to_nearest_silence_within_window(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "lecture.mp3"
+    source.write_bytes(b"audio")
+    calls: list[tuple[float, float | None]] = []
+    windows: list[tuple[int, int]] = []
+
+    def fake_convert(src: Path, destination: Path, **kwargs) -> Path:
+        calls.append((kwargs["start_seconds"], kwargs["duration_seconds"]))
+        destination.write_bytes(b"mp3")
+        return destination
+
+    def fake_window(src: Path, start: int, length: int, **kwargs):
+        windows.append((start, length))
+        return object()
+
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+    monkeypatch.setattr(audio_splitter, "read_analysis_window", fake_window)
+    monkeypatch.setattr(audio_splitter, "find_quiet_point", lambda window, target, **kwargs: target - 2_500)
+
+    audio_splitter.split_audio(source, tmp_path / "output", duration_minutes=1, mode="stream", silence_window_seconds=5)
+
+    assert windows == [(55_000, 10_000), (115_000, 10_000)]
+    assert calls == [(0.0, 57.5), (57.5, 60.0), (117.5, None)]
+
+
+def test_tail_is_kept_when_last_cut_moves_earlier(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "lecture.mp3"
+    source.write_bytes(b"audio")
+    calls: list[tuple[float, float | None]] = []
+
+    def fake_convert(src: Path, destination: Path, **kwargs) -> Path:
+        calls.append((kwargs["start_seconds"], kwargs["duration_seconds"]))
+        destination.write_bytes(b"mp3")
+        return destination
+
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 119.0)
+    monkeypatch.setattr(audio_splitter, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+    monkeypatch.setattr(audio_splitter, "read_analysis_window", lambda src, start, length, **kwargs: object())
+    monkeypatch.setattr(audio_splitter, "find_quiet_point", lambda window, target, **kwargs: target - 2_500)
+
+    audio_splitter.split_audio(source, tmp_path / "output", duration_minutes=1, mode="stream", silence_window_seconds=5)
+
+    assert calls == [(0.0, 57.5), (57.5, None)]
+
+
+def test_decode_mode_last_slice_ends_at_audio_length(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "lecture.mp3"
+    source.write_bytes(b"audio")
+    exported: list[tuple[int, int]] = []
+
+    class FakeSegment:
+        converter = ""
+
+        def __init__(self, start: int = 0, stop: int = 119_000) -> None:
+            self.start, self.stop = start, stop
+
+        @classmethod
+        def from_file(cls, path: Path):
+            return cls()
+
+        def __len__(self) -> int:
+            return self.stop - self.start
+
+        def __getitem__(self, item: slice):
+            return FakeSegment(item.start, item.stop)
+
+        def export(self, destination: Path, **kwargs) -> None:
+            exported.append((self.start, self.stop))
+            Path(destination).write_bytes(b"mp3")
+
+    monkeypatch.setattr(audio_splitter, "AudioSegment", FakeSegment)
+    monkeypatch.setattr(audio_splitter, "require_ffmpeg", lambda value: value)
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 119.0)
+    monkeypatch.setattr(audio_splitter, "verify_mp3", lambda path: True)
+    monkeypatch.setattr(audio_splitter, "find_quiet_point", lambda window, target, **kwargs: target - 2_500)
+
+    audio_splitter.split_audio(source, tmp_path / "output", duration_minutes=1, silence_window_seconds=5)
+
+    assert exported == [(0, 57_500), (57_500, 119_000)]
+
+
+def test_markers_mode_stream_copies_chapters_in_source_format(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "book.m4a"
+    source.write_bytes(b"audio")
+    calls: list[tuple[str, float, float | None]] = []
+
+    def fake_extract(src: Path, destination: Path, **kwargs) -> Path:
+        calls.append((destination.name, kwargs["start_seconds"], kwargs["duration_seconds"]))
+        destination.write_bytes(b"m4a")
+        return destination
+
+    monkeypatch.setattr(
+        audio_splitter,
+        "read_markers",
+        lambda path: [Marker(1.5, "Opening"), Marker(100.0, "Chapter 1"), Marker(250.0, "Chapter 2")],
+    )
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 400.0)
+    monkeypatch.setattr(audio_splitter, "extract_segment", fake_extract)
+    monkeypatch.setattr(audio_splitter, "verify_audio", lambda path: True)
+
+    outputs = audio_splitter.split_audio(source, tmp_path / "output", duration_minutes=30, mode="markers")
+
+    assert [path.name for path in outputs] == ["book_01_Opening.m4a", "book_02_Chapter 1.m4a", "book_03_Chapter 2.m4a"]
+    assert calls == [
+        ("book_01_Opening.m4a", 0.0, 100.0),
+        ("book_02_Chapter 1.m4a", 100.0, 150.0),
+        ("book_03_Chapter 2.m4a", 250.0, None),
+    ]
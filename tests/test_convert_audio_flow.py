@@ -0,0 +1,72 @@
+import logging
+import threading
+from pathlib import Path
+
+from mp3_processor.context import AppContext
+from mp3_processor.execution import ProgressEvent
+from mp3_processor.flows import convert_audio_flow
+from mp3_processor.modules import scheduling
+from mp3_processor.modules.audio_converter import EncodeProgress
+
+
+def test_parallel_progress_sums_in_flight_jobs(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    for name in ("a.m4a", "b.m4a"):
+        (source_root / name).write_bytes(b"audio")
+    both_started = threading.Barrier(2)
+    first_reported = threading.Event()
+
+    def fake_convert(source: Path, destination: Path, *, on_progress, **kwargs) -> Path:
+        # a 先报告 90%，b 在其后报告 10%；两者都在进行中时整体进度不应回退。
+        if source.name == "b.m4a":
+            first_reported.wait(5)
+        on_progress(EncodeProgress(90.0 if source.name == "a.m4a" else 10.0, 100.0))
+        if source.name == "a.m4a":
+            first_reported.set()
+        both_started.wait(5)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(b"mp3")
+        return destination
+
+    monkeypatch.setattr(convert_audio_flow, "convert_to_mp3", fake_convert)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+    events: list[ProgressEvent] = []
+
+    result = convert_audio_flow.run(context, workers=2, validate_output=False, progress=events.append)
+
+    percents = [event.percent for event in events if event.stage == "running"]
+    assert result.succeeded == 2
+    assert percents == sorted(percents)
+    assert max(event.fraction for event in events) == 1.0
+
+
+def test_in_flight_progress_reads_count_and_fractions_together() -> None:
+    in_flight = convert_audio_flow._InFlightProgress(completed=1)
+
+    assert in_flight.update(0, 0.9) == (1, 0.9)
+    assert in_flight.update(1, 0.5) == (1, 1.4)
+    assert in_flight.finish(0) == (2, 0.5)
+    assert in_flight.start() == (2, 0.5)
+
+
+def test_watchdog_estimates_duration_from_size_when_header_is_unreadable(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    with (source_root / "long.m4a").open("wb") as handle:
+        handle.truncate(scheduling.FALLBACK_BYTES_PER_SECOND * 3600)
+    timeouts: list[float | None] = []
+
+    def fake_convert(source: Path, destination: Path, **kwargs) -> Path:
+        timeouts.append(kwargs["timeout_seconds"])
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(b"mp3")
+        return destination
+
+    monkeypatch.setattr(convert_audio_flow, "convert_to_mp3", fake_convert)
+    monkeypatch.setattr(scheduling, "probe_duration", lambda path: None)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    convert_audio_flow.run(context, validate_output=False, timeout_base_seconds=300)
+
+    assert timeouts == [300 + 3600 * 0.1]
@@ -1,8 +1,12 @@
+import io
 from pathlib import Path
 
+from mutagen.id3 import ID3
+from mutagen.mp3 import MP3
 from PIL import Image
 
-from mp3_processor.modules.cover_editor import crop_image
+from mp3_processor.modules.cover_editor import crop_image, embed_cover, load_cover, optimize_cover, set_cover
+from mp3_processor.modules.metadata_editor import open_audio
 
 
 def test_crop_image_writes_expected_dimensions(tmp_path: Path) -> None:
@@ -15,3 +19,52 @@ def test_crop_image_writes_expected_dimensions(tmp_path: Path) -> None:
     with Image.open(destination) as image:
         assert image.size == (60, 50)
         assert image.mode == "RGBA"
+
+
+def test_cover_payload_shares_image_bytes_across_files(tmp_path: Path, mp3_file) -> None:
+    cover = tmp_path / "cover.jpg"
+    Image.new("RGB", (16, 16), (0, 0, 255)).save(cover)
+    payload = load_cover(cover)
+    audios = []
+    for name in ("a.mp3", "b.mp3"):
+        path = tmp_path / name
+        mp3_file(path)
+        audio = open_audio(path)
+        set_cover(audio, payload)
+        audios.append(audio)
+
+    assert all(isinstance(audio, MP3) and audio.tags["APIC:Cover"].data is payload.data for audio in audios)
+    assert payload.mime == "image/jpeg"
+
+    assert embed_cover(tmp_path / "a.mp3", payload)
+    assert ID3(tmp_path / "a.mp3")["APIC:Cover"].data == cover.read_bytes()
+
+
+def test_embed_cover_skips_identical_picture(tmp_path: Path, mp3_file) -> None:
+    audio = tmp_path / "track.mp3"
+    mp3_file(audio)
+    cover, other = tmp_path / "cover.png", tmp_path / "other.png"
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(cover)
+    Image.new("RGB", (8, 8), (0, 255, 0)).save(other)
+
+    assert embed_cover(audio, cover)
+    modified = audio.stat().st_mtime_ns
+    assert not embed_cover(audio, cover)
+    assert audio.stat().st_mtime_ns == modified
+    assert embed_cover(audio, other)
+    assert ID3(audio)["APIC:Cover"].data == other.read_bytes()
+
+
+def test_optimize_cover_resizes_and_meets_byte_budget(tmp_path: Path) -> None:
+    source = tmp_path / "large.png"
+    Image.effect_noise((1200, 900), 80).convert("RGB").save(source)
+    data = source.read_bytes()
+
+    optimized, mime = optimize_cover(data, "image/png", max_pixels=600, max_bytes=60 * 1024)
+
+    assert mime == "image/jpeg"
+    assert len(optimized) <= 60 * 1024
+    with Image.open(io.BytesIO(optimized)) as image:
+        assert max(image.size) <= 600
+    assert optimize_cover(data, "image/png", max_pixels=2000) == (data, "image/png")
+    assert load_cover(source, max_pixels=600).mime == "image/jpeg"
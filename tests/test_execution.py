@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 from pathlib import Path
+from threading import Lock
+from time import sleep
 
 import pytest
 
-from mp3_processor.execution import CancellationToken, ProgressEvent, TaskCancelled, report_progress
+from mp3_processor.execution import (
+    CancellationToken,
+    ProgressEvent,
+    TaskCancelled,
+    report_progress,
+    resolve_workers,
+    run_concurrently,
+)
 
 
 def test_cancellation_token_raises_after_cancel() -> None:
@@ -25,3 +34,49 @@ def test_report_progress_sends_structured_event() -> None:
     report_progress(events.append, "running", "正在转换", current=2, total=5, item=item)
 
     assert events == [ProgressEvent("running", "正在转换", 2, 5, item)]
+
+
+def test_run_concurrently_bounds_in_flight_jobs_and_captures_errors() -> None:
+    lock = Lock()
+    running = 0
+    peak = 0
+
+    def job(value: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        sleep(0.01)
+        with lock:
+            running -= 1
+        if value == 3:
+            raise ValueError("bad input")
+        return value * 10
+
+    outcomes = list(run_concurrently(job, range(8), workers=3))
+
+    assert peak <= 3
+    assert sorted(outcome.value for outcome in outcomes if outcome.error is None) == [0, 10, 20, 40, 50, 60, 70]
+    assert [str(outcome.error) for outcome in outcomes if outcome.error is not None] == ["bad input"]
+
+
+def test_run_concurrently_stops_submitting_after_cancel() -> None:
+    token = CancellationToken()
+    started: list[int] = []
+
+    def job(value: int) -> int:
+        if value == 1:
+            token.cancel()
+        return value
+
+    with pytest.raises(TaskCancelled):
+        list(run_concurrently(job, range(10), workers=2, cancel_token=token, on_start=started.append))
+
+    assert len(started) < 10
+
+
+def test_resolve_workers_uses_cpu_count_for_zero() -> None:
+    assert resolve_workers(0) >= 1
+    assert resolve_workers(4) == 4
+    with pytest.raises(ValueError):
+        resolve_workers(-1)
@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from mp3_processor.modules.files import iter_files, output_path_for
+import pytest
+
+from mp3_processor.modules import files
+from mp3_processor.modules.files import TEMP_SUFFIX, atomic_output, iter_files, output_path_for, sweep_temp_files
 
 
 def test_iter_files_is_recursive_filtered_and_stable(tmp_path: Path) -> None:
@@ -31,3 +34,66 @@ def test_iter_files_can_limit_recursion_depth(tmp_path: Path) -> None:
     (second / "two.m4a").write_bytes(b"")
 
     assert list(iter_files(tmp_path, ["m4a"], max_depth=1)) == [first / "one.m4a"]
+
+
+def test_iter_files_prunes_directories_beyond_max_depth(tmp_path: Path, monkeypatch) -> None:
+    deep = tmp_path / "one" / "two" / "three"
+    deep.mkdir(parents=True)
+    (tmp_path / "one" / "a.mp3").write_bytes(b"")
+    (deep / "b.mp3").write_bytes(b"")
+    scanned: list[str] = []
+    real_scandir = files.os.scandir
+
+    def recording_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(files.os, "scandir", recording_scandir)
+
+    assert list(iter_files(tmp_path, ["mp3"], max_depth=1)) == [tmp_path / "one" / "a.mp3"]
+    assert scanned == [str(tmp_path), str(tmp_path / "one")]
+
+
+def test_iter_files_unsorted_mode_streams_same_files(tmp_path: Path) -> None:
+    for name in ("c", "a", "b"):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}.m4a").write_bytes(b"")
+        (folder / f"{name}.txt").write_bytes(b"")
+
+    sorted_files = list(iter_files(tmp_path, [".m4a"]))
+    streamed = list(iter_files(tmp_path, [".m4a"], sort=False))
+
+    assert sorted(streamed) == sorted(sorted_files)
+    assert sorted_files == [tmp_path / name / f"{name}.m4a" for name in ("a", "b", "c")]
+
+
+def test_atomic_output_keeps_existing_file_when_writer_fails(tmp_path: Path) -> None:
+    destination = tmp_path / "out" / "a.mp3"
+    destination.parent.mkdir()
+    destination.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(destination) as temporary:
+            temporary.write_bytes(b"trunc")
+            raise RuntimeError("crash")
+
+    assert destination.read_bytes() == b"old"
+    assert list(destination.parent.iterdir()) == [destination]
+
+    with atomic_output(destination) as temporary:
+        temporary.write_bytes(b"new")
+
+    assert destination.read_bytes() == b"new"
+
+
+def test_sweep_removes_orphaned_temp_files_only(tmp_path: Path) -> None:
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    orphan = nested / f".a.mp3.1234abcd{TEMP_SUFFIX}"
+    orphan.write_bytes(b"partial")
+    (nested / "a.mp3").write_bytes(b"done")
+
+    assert sweep_temp_files(tmp_path) == [orphan]
+    assert [path.name for path in nested.iterdir()] == ["a.mp3"]
+    assert sweep_temp_files(tmp_path / "missing") == []
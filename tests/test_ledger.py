@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from mp3_processor.modules import ledger as ledger_module
+from mp3_processor.modules.ledger import ProcessingLedger
+
+
+def test_ledger_detects_source_and_parameter_changes(tmp_path: Path) -> None:
+    source = tmp_path / "lecture.m4a"
+    source.write_bytes(b"audio")
+    output = tmp_path / "lecture.mp3"
+    output.write_bytes(b"mp3")
+    params = {"codec": "libmp3lame", "bitrate": "192k"}
+
+    with ProcessingLedger(tmp_path / "ledger.sqlite3") as ledger:
+        assert not ledger.is_current(source, output, params)
+        ledger.record(source, output, params, [output])
+        assert ledger.is_current(source, output, params)
+        assert not ledger.is_current(source, output, {**params, "bitrate": "320k"})
+
+        source.write_bytes(b"changed audio")
+        assert not ledger.is_current(source, output, params)
+
+        ledger.record(source, output, params, [output])
+        output.unlink()
+        assert not ledger.is_current(source, output, params)
+
+
+def test_ledger_hash_ignores_touched_but_identical_sources(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "lecture.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "split"
+    output_dir.mkdir()
+    part = output_dir / "lecture_part_01.mp3"
+    part.write_bytes(b"mp3")
+    params = {"duration_minutes": 30.0}
+
+    with ProcessingLedger(tmp_path / "ledger.sqlite3", hash_sources=True) as ledger:
+        ledger.record(source, output_dir, params, [part])
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        assert ledger.is_current(source, output_dir, params)
+        entry = ledger.lookup(source, output_dir)
+        assert entry.outputs == [part]
+        assert entry.fingerprint.mtime_ns == source.stat().st_mtime_ns
+
+        def fail_hash(path: Path, *, with_hash: bool = False):
+            raise AssertionError("大小和时间戳一致时不应计算哈希")
+
+        monkeypatch.setattr(ledger_module, "fingerprint", fail_hash)
+        assert ledger.is_current(source, output_dir, params)
+
+
+def test_ledger_adopts_unrecorded_outputs_newer_than_source(tmp_path: Path) -> None:
+    source = tmp_path / "lecture.m4a"
+    source.write_bytes(b"audio")
+    fresh, stale = tmp_path / "fresh.mp3", tmp_path / "stale.mp3"
+    fresh.write_bytes(b"mp3")
+    stale.write_bytes(b"mp3")
+    stat = source.stat()
+    os.utime(fresh, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.utime(stale, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+    params = {"codec": "libmp3lame", "bitrate": "192k"}
+
+    with ProcessingLedger(tmp_path / "ledger.sqlite3") as ledger:
+        assert ledger.adopt(source, fresh, params, [fresh])
+        assert ledger.is_current(source, fresh, params)
+        assert not ledger.adopt(source, fresh, {**params, "bitrate": "320k"}, [fresh])
+        assert not ledger.adopt(source, stale, params, [stale])
+        assert not ledger.is_current(source, stale, params)
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from mutagen.id3 import CHAP, ID3, TIT2
+
+from mp3_processor.modules.markers import Marker, marker_paths, parse_cue, read_markers
+
+
+def test_parse_cue_reads_track_titles_and_index_times(tmp_path: Path) -> None:
+    cue = tmp_path / "album.cue"
+    cue.write_bytes(
+        (
+            'TITLE "整张专辑"\n'
+            'FILE "album.mp3" MP3\n'
+            "  TRACK 01 AUDIO\n"
+            '    TITLE "第一章"\n'
+            "    INDEX 01 00:00:00\n"
+            "  TRACK 02 AUDIO\n"
+            '    TITLE "第二章"\n'
+            "    INDEX 00 04:58:00\n"
+            "    INDEX 01 05:00:15\n"
+        ).encode("gb18030")
+    )
+
+    assert parse_cue(cue) == [Marker(0.0, "第一章"), Marker(300.2, "第二章")]
+
+
+def test_id3_chapters_are_read_in_start_order(tmp_path: Path, mp3_file) -> None:
+    source = tmp_path / "book.mp3"
+    mp3_file(source)
+    tags = ID3()
+    tags.add(CHAP(element_id="ch2", start_time=90_000, end_time=180_000, sub_frames=[TIT2(encoding=3, text=["Two"])]))
+    tags.add(CHAP(element_id="ch1", start_time=0, end_time=90_000, sub_frames=[TIT2(encoding=3, text=["One"])]))
+    tags.save(source)
+
+    assert read_markers(source) == [Marker(0.0, "One"), Marker(90.0, "Two")]
+
+
+def test_marker_paths_use_sanitized_titles(tmp_path: Path) -> None:
+    paths = marker_paths(tmp_path / "Book.M4A", tmp_path, [Marker(0.0, 'Intro: "A/B"'), Marker(60.0, "")])
+
+    assert [path.name for path in paths] == ["Book_01_Intro_ _A_B_.m4a", "Book_part_02.m4a"]
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from mp3_processor.modules import media_probe
+from mp3_processor.modules.media_probe import MediaProbeCache, probe_many, probe_media
+
+
+def test_probe_reads_header_fields(tmp_path: Path, monkeypatch, mp3_file) -> None:
+    monkeypatch.setattr(media_probe, "_MEMO", {})
+    audio = tmp_path / "a.mp3"
+    mp3_file(audio, frames=40)
+    (tmp_path / "b.mp3").write_bytes(b"not audio")
+
+    info = probe_media(audio)
+
+    assert info is not None
+    assert info.duration_seconds > 0
+    assert (info.bitrate, info.sample_rate, info.codec) == (128000, 44100, "mp3")
+    assert probe_media(tmp_path / "b.mp3") is None
+    assert probe_media(tmp_path / "missing.mp3") is None
+
+
+def test_persistent_cache_reuses_results_until_file_changes(tmp_path: Path, monkeypatch, mp3_file) -> None:
+    audio = tmp_path / "a.mp3"
+    mp3_file(audio, frames=40)
+    cache = tmp_path / "cache" / "media.sqlite3"
+    reads: list[Path] = []
+    read_header = media_probe._read_header
+
+    def counting_read(path: Path):
+        reads.append(path)
+        return read_header(path)
+
+    monkeypatch.setattr(media_probe, "_read_header", counting_read)
+    monkeypatch.setattr(media_probe, "_MEMO", {})
+    first = probe_many([audio], cache=cache)
+    monkeypatch.setattr(media_probe, "_MEMO", {})
+    with MediaProbeCache(cache) as probe_cache:
+        assert probe_cache.probe(audio) == first[audio]
+        assert (probe_cache.hits, probe_cache.misses) == (1, 0)
+
+    mp3_file(audio, frames=80)
+    second = probe_many([audio], cache=cache)
+
+    assert reads == [audio, audio]
+    assert second[audio] is not None and first[audio] is not None
+    assert second[audio].duration_seconds > first[audio].duration_seconds
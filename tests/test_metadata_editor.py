@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from mp3_processor.modules.metadata_editor import album_for_file, title_from_filename
+from mutagen.easyid3 import EasyID3
+
+from mp3_processor.modules.metadata_editor import album_for_file, title_from_filename, update_audio_tags
+from mp3_processor.modules.padding import PaddingPolicy
 
 
 def test_title_from_filename_removes_episode_leading_zeroes() -> None:
@@ -13,3 +16,30 @@ def test_album_for_file_appends_parent_directory(tmp_path: Path) -> None:
 
     assert album_for_file(audio, root, "Demo", True) == "Demo season-1"
     assert album_for_file(audio, root, "Demo", False) == "Demo"
+
+
+def test_update_audio_tags_skips_save_when_tags_match(tmp_path: Path, mp3_file) -> None:
+    audio = tmp_path / "第001集.mp3"
+    mp3_file(audio)
+
+    assert update_audio_tags(audio, artist="讲者", album="专辑")
+    modified = audio.stat().st_mtime_ns
+    assert not update_audio_tags(audio, artist="讲者", album="专辑")
+    assert audio.stat().st_mtime_ns == modified
+    assert update_audio_tags(audio, artist="讲者", album="新专辑")
+    assert EasyID3(audio)["album"] == ["新专辑"]
+    assert EasyID3(audio)["title"] == ["第1集"]
+
+
+def test_padding_policy_reserves_space_so_later_edits_stay_in_place(tmp_path: Path, mp3_file) -> None:
+    audio = tmp_path / "track.mp3"
+    original_size = mp3_file(audio).stat().st_size
+    policy = PaddingPolicy(reserve_bytes=64 * 1024)
+
+    update_audio_tags(audio, artist="A", album="B", padding=policy)
+    size = audio.stat().st_size
+    update_audio_tags(audio, artist="A" * 200, album="C", padding=policy)
+
+    assert policy.stats() == {"in_place_writes": 1, "full_rewrites": 1}
+    assert size > original_size + 64 * 1024
+    assert audio.stat().st_size == size
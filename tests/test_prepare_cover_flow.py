@@ -0,0 +1,46 @@
+import logging
+from pathlib import Path
+
+from PIL import Image
+
+from mp3_processor.context import AppContext
+from mp3_processor.flows import prepare_cover_flow
+
+
+def test_process_pool_crops_in_path_order_and_keeps_skip_semantics(tmp_path: Path) -> None:
+    source_root = tmp_path / "covers"
+    (source_root / "nested").mkdir(parents=True)
+    for name in ("c.png", "a.png", "nested/b.jpg"):
+        Image.new("RGB", (40, 40), (10, 20, 30)).save(source_root / name)
+    (source_root / "broken.png").write_bytes(b"not an image")
+    target_root = tmp_path / "output"
+    (target_root / "nested").mkdir(parents=True)
+    (target_root / "nested" / "b.jpg").write_bytes(b"existing")
+    context = AppContext(tmp_path, {"app": {}, "flows": {}}, logging.getLogger("test"))
+
+    result = prepare_cover_flow.run(
+        context,
+        input_path=source_root,
+        output_dir=target_root,
+        crop_box=(0, 0, 20, 10),
+        workers=2,
+    )
+
+    assert [path.relative_to(target_root).as_posix() for path in result.outputs] == ["a.png", "c.png"]
+    assert (result.succeeded, result.skipped, result.failed) == (2, 1, 1)
+    assert (target_root / "nested" / "b.jpg").read_bytes() == b"existing"
+    with Image.open(target_root / "a.png") as image:
+        assert image.size == (20, 10)
+
+
+def test_workers_default_to_cpu_count_when_not_configured(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "covers"
+    source_root.mkdir()
+    Image.new("RGB", (40, 40)).save(source_root / "a.png")
+    requested = []
+    monkeypatch.setattr(prepare_cover_flow, "resolve_workers", lambda workers: requested.append(workers) or 1)
+    context = AppContext(tmp_path, {"app": {}, "flows": {}}, logging.getLogger("test"))
+
+    prepare_cover_flow.run(context, input_path=source_root, output_dir=tmp_path / "output", crop_box=(0, 0, 20, 10))
+
+    assert requested == [0]
@@ -0,0 +1,57 @@
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from mp3_processor.modules.files import iter_files
+from mp3_processor.modules.scan_index import ScanIndex
+
+
+def age_tree(root: Path, seconds: int = 3600) -> None:
+    for directory in [root, *(path for path in root.rglob("*") if path.is_dir())]:
+        stat = directory.stat()
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_scan_index_only_relists_changed_directories(tmp_path: Path) -> None:
+    root = tmp_path / "library"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "one.mp3").write_bytes(b"1")
+    (root / "b" / "two.mp3").write_bytes(b"22")
+    age_tree(root)
+    index_path = tmp_path / "cache" / "scan_index.sqlite3"
+
+    assert list(iter_files(root, ["mp3"], index=index_path)) == [root / "a" / "one.mp3", root / "b" / "two.mp3"]
+
+    (root / "b" / "three.mp3").write_bytes(b"")
+    with ScanIndex(index_path) as index:
+        listed = {entry.name for entry in index.list_directory(str(root / "b"))}
+        index.list_directory(str(root))
+        index.list_directory(str(root / "a"))
+        assert listed == {"two.mp3", "three.mp3"}
+        assert (index.reused, index.scanned) == (2, 1)
+
+    assert list(iter_files(root, ["mp3"], index=index_path)) == [
+        root / "a" / "one.mp3",
+        root / "b" / "three.mp3",
+        root / "b" / "two.mp3",
+    ]
+
+
+def test_scan_index_forgets_removed_subtrees_and_supports_full_rescan(tmp_path: Path) -> None:
+    root = tmp_path / "library"
+    (root / "old" / "nested").mkdir(parents=True)
+    (root / "old" / "nested" / "gone.mp3").write_bytes(b"")
+    age_tree(root)
+    index_path = tmp_path / "scan_index.sqlite3"
+    assert list(iter_files(root, ["mp3"], index=index_path)) == [root / "old" / "nested" / "gone.mp3"]
+
+    (root / "old" / "nested" / "gone.mp3").unlink()
+    (root / "old" / "nested").rmdir()
+    (root / "old").rmdir()
+
+    assert list(iter_files(root, ["mp3"], index=index_path, rescan=True)) == []
+    with closing(sqlite3.connect(index_path)) as connection:
+        assert connection.execute("SELECT path FROM directories").fetchall() == [(str(root),)]
+        assert connection.execute("SELECT count(*) FROM entries").fetchone() == (0,)
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from mp3_processor.modules import scheduling
+from mp3_processor.modules.scheduling import estimate_seconds, plan_longest_first
+
+
+def test_longest_first_balances_parallel_workers() -> None:
+    durations = {"a": 1.0, "b": 2.0, "c": 10.0, "d": 3.0, "e": 4.0}
+
+    plan = plan_longest_first(list(durations), durations.__getitem__, workers=2)
+
+    assert plan.items == ["c", "e", "d", "b", "a"]
+    assert plan.makespan_seconds == 10.0
+    assert plan.total_seconds == 20.0
+
+
+def test_estimate_falls_back_to_file_size(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "broken.wma"
+    source.write_bytes(b"\x00" * 32_000)
+    monkeypatch.setattr(scheduling, "probe_duration", lambda path: None)
+
+    assert estimate_seconds(source) == 2.0
+    assert estimate_seconds(tmp_path / "missing.wma") == 0.0
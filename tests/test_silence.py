@@ -0,0 +1,25 @@
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from mp3_processor.modules.silence import find_quiet_point
+
+
+def speech_with_pauses(*pauses: tuple[int, int], length_ms: int = 10_000) -> AudioSegment:
+    audio = Sine(440, sample_rate=8000).to_audio_segment(duration=length_ms, volume=-6)
+    for start, end in pauses:
+        audio = audio[:start] + AudioSegment.silent(end - start, frame_rate=8000) + audio[end:]
+    return audio
+
+
+def test_quiet_point_picks_nearest_pause_to_target() -> None:
+    window = speech_with_pauses((1_000, 1_400), (6_000, 6_300))
+
+    assert 6_000 <= find_quiet_point(window, 5_000) <= 6_300
+    assert 1_000 <= find_quiet_point(window, 2_000) <= 1_400
+
+
+def test_quiet_point_falls_back_to_quietest_chunk() -> None:
+    speech = speech_with_pauses()
+    window = speech[:3_000] + (speech[:500] - 20) + speech[:3_000]
+
+    assert 3_000 <= find_quiet_point(window, 0) <= 3_500
@@ -0,0 +1,82 @@
+import logging
+from pathlib import Path
+
+from mp3_processor.context import AppContext
+from mp3_processor.flows import split_audio_flow
+from mp3_processor.modules import audio_splitter
+
+
+def test_markers_ledger_tracks_cue_sheet_not_duration(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    source = source_root / "book.mp3"
+    source.write_bytes(b"audio")
+    cue = source_root / "book.cue"
+    cue.write_text('TRACK 01 AUDIO\n  INDEX 01 00:00:00\n', encoding="utf-8")
+    calls: list[Path] = []
+
+    def fake_split(src: Path, output_dir: Path, **kwargs) -> list[Path]:
+        calls.append(src)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        part = output_dir / "book_01.mp3"
+        part.write_bytes(b"mp3")
+        return [part]
+
+    monkeypatch.setattr(split_audio_flow, "split_audio", fake_split)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    def run(**kwargs):
+        return split_audio_flow.run(context, mode="markers", use_ledger=True, **kwargs)
+
+    assert run(duration_minutes=30).succeeded == 1
+    assert run(duration_minutes=10, bitrate="320k").skipped == 1
+    cue.write_text('TRACK 01 AUDIO\n  INDEX 01 00:00:00\nTRACK 02 AUDIO\n  INDEX 01 10:00:00\n', encoding="utf-8")
+    assert run(duration_minutes=10).succeeded == 1
+    assert len(calls) == 2
+
+
+def test_ledger_adopts_existing_segment_sets_on_first_enable(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    source = source_root / "book.mp3"
+    source.write_bytes(b"audio")
+    output_dir = tmp_path / "output" / "split" / "book"
+    output_dir.mkdir(parents=True)
+    for index in (1, 2, 3):
+        (output_dir / f"book_part_0{index}.mp3").write_bytes(b"mp3")
+
+    def fail_split(src: Path, output_dir: Path, **kwargs) -> list[Path]:
+        raise AssertionError("已有完整分段时不应重新切分")
+
+    monkeypatch.setattr(split_audio_flow, "split_audio", fail_split)
+    monkeypatch.setattr(audio_splitter, "probe_duration", lambda path: 150.0)
+    monkeypatch.setattr(split_audio_flow, "probe_many", lambda paths, cache: None)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    result = split_audio_flow.run(context, duration_minutes=1, use_ledger=True)
+
+    assert result.skipped == 1
+
+
+def test_copy_mode_ledger_ignores_bitrate(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    (source_root / "book.mp3").write_bytes(b"audio")
+    calls: list[Path] = []
+
+    def fake_split(src: Path, output_dir: Path, **kwargs) -> list[Path]:
+        calls.append(src)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        part = output_dir / "book_part_01.mp3"
+        part.write_bytes(b"mp3")
+        return [part]
+
+    monkeypatch.setattr(split_audio_flow, "split_audio", fake_split)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    def run(**kwargs):
+        return split_audio_flow.run(context, mode="copy", duration_minutes=30, use_ledger=True, **kwargs)
+
+    assert run(bitrate="192k").succeeded == 1
+    assert run(bitrate="320k").skipped == 1
+    assert len(calls) == 1
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from mutagen.id3 import ID3
+from PIL import Image
+
+from mp3_processor.modules.cover_editor import load_cover
+from mp3_processor.modules.padding import PaddingPolicy
+from mp3_processor.modules.tag_writer import write_tags_and_cover
+
+
+def test_write_tags_and_cover_saves_once_and_reports_each_part(tmp_path: Path, mp3_file) -> None:
+    audio = tmp_path / "第001集.mp3"
+    mp3_file(audio)
+    cover = tmp_path / "cover.png"
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(cover)
+    payload = load_cover(cover)
+    policy = PaddingPolicy(reserve_bytes=64 * 1024)
+
+    first = write_tags_and_cover(audio, artist="讲者", album="专辑", cover=payload, padding=policy)
+    modified = audio.stat().st_mtime_ns
+    second = write_tags_and_cover(audio, artist="讲者", album="专辑", cover=payload, padding=policy)
+    unchanged_mtime = audio.stat().st_mtime_ns
+    third = write_tags_and_cover(audio, artist="讲者", album="新专辑", cover=payload, padding=policy)
+
+    assert (first.tags_changed, first.cover_changed) == (True, True)
+    assert not second.saved
+    assert unchanged_mtime == modified
+    assert (third.tags_changed, third.cover_changed) == (True, False)
+    assert policy.stats() == {"in_place_writes": 1, "full_rewrites": 1}
+    tags = ID3(audio)
+    assert tags["TIT2"].text == ["第1集"]
+    assert tags["TALB"].text == ["新专辑"]
+    assert tags["APIC:Cover"].data == cover.read_bytes()
@@ -0,0 +1,77 @@
+import logging
+from pathlib import Path
+
+from mp3_processor.context import AppContext
+from mp3_processor.flows import update_metadata_and_cover_flow, update_metadata_flow
+from mp3_processor.modules.cover_editor import CoverPayload
+from mp3_processor.modules.tag_writer import TagWriteResult
+
+
+def test_parallel_tag_writes_keep_path_order_and_capture_errors(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    for name in ("c.mp3", "a.mp3", "b.m4a", "d.mp3", "e.mp3"):
+        (source_root / name).write_bytes(b"")
+    written: list[str] = []
+
+    def fake_update(path: Path, *, artist: str | None, album: str | None, **kwargs) -> bool:
+        if path.name == "b.m4a":
+            raise ValueError(f"标签损坏: {path.name}")
+        if path.name == "e.mp3":
+            return False
+        written.append(path.name)
+        return True
+
+    monkeypatch.setattr(update_metadata_flow, "update_audio_tags", fake_update)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    result = update_metadata_flow.run(context, write=True, workers=3)
+
+    assert sorted(written) == ["a.mp3", "c.mp3", "d.mp3"]
+    assert [path.name for path in result.outputs] == ["a.mp3", "c.mp3", "d.mp3"]
+    assert (result.succeeded, result.unchanged, result.failed) == (3, 1, 1)
+    assert result.errors == ["标签损坏: b.m4a"]
+
+
+def test_combined_flow_reports_tag_and_cover_outcomes_separately(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    for name in ("a.mp3", "b.m4a", "c.wma"):
+        (source_root / name).write_bytes(b"")
+    cover = tmp_path / "cover.png"
+    cover.write_bytes(b"png")
+
+    def fake_write(path: Path, *, cover: CoverPayload | None, **kwargs) -> TagWriteResult:
+        assert cover is not None and cover.data == b"png"
+        payloads.add(id(cover))
+        return TagWriteResult(tags_changed=path.name != "b.m4a", cover_changed=path.name != "c.wma")
+
+    payloads: set[int] = set()
+    monkeypatch.setattr(update_metadata_and_cover_flow, "write_tags_and_cover", fake_write)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    result = update_metadata_and_cover_flow.run(context, cover_image=cover, write=True, workers=2)
+
+    assert [path.name for path in result.outputs] == ["a.mp3", "b.m4a", "c.wma"]
+    assert (result.succeeded, result.unchanged, result.failed) == (3, 0, 0)
+    assert result.stats["tags_updated"] == 2
+    assert result.stats["tags_unchanged"] == 1
+    assert result.stats["covers_written"] == 2
+    assert result.stats["covers_unchanged"] == 1
+    assert len(payloads) == 1
+
+
+def test_metadata_and_cover_preview_does_not_load_cover(tmp_path: Path, monkeypatch) -> None:
+    source_root = tmp_path / "input"
+    source_root.mkdir()
+    (source_root / "a.mp3").write_bytes(b"audio")
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("预览时不应读取封面")
+
+    monkeypatch.setattr(update_metadata_and_cover_flow, "load_configured_cover", fail_load)
+    context = AppContext(tmp_path, {"app": {"input_path": "input"}, "flows": {}}, logging.getLogger("test"))
+
+    result = update_metadata_and_cover_flow.run(context, cover_image=tmp_path / "missing.jpg")
+
+    assert result.skipped == 1
@@ -11,10 +11,13 @@
   --input        临时覆盖输入目录。
   --max-files    限制本次扫描文件数。
   --write        实际写入文件；未提供时仅预览，不修改业务数据。
+  --workers      同时写入标签的文件数，0 表示使用全部 CPU 核；网络存储上可适当调大。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
 
 示例：
   python update_metadata.py --max-files 5
   python update_metadata.py --write
+  python update_metadata.py --write --workers 16
 
 输出：
   控制台输出 JSON 汇总；--write 会原地更新音频标签。
@@ -39,9 +42,20 @@ def main() -> int:
     parser.add_argument("--input")
     parser.add_argument("--max-files", type=int)
     parser.add_argument("--write", action="store_true")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--full-rescan", action="store_true")
     args = parser.parse_args()
     context = bootstrap_context(__file__, args.config_file)
-    return print_result(run(context, input_path=args.input, write=args.write, max_files=args.max_files))
+    return print_result(
+        run(
+            context,
+            input_path=args.input,
+            write=args.write,
+            max_files=args.max_files,
+            full_rescan=args.full_rescan,
+            workers=args.workers,
+        )
+    )
 
 
 if __name__ == "__main__":
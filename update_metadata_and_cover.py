@@ -0,0 +1,73 @@
+"""批量音频元数据与封面工具
+
+用途：
+  根据文件名生成标题，并在一次打开、一次保存中同时设置 MP3/M4A/WMA 的艺术家、专辑标签和封面。
+  效果等同于先后运行 update_metadata.py 和 apply_cover.py，但每个文件只解析和写入一次。
+
+配置文件：
+  默认读取 config.yaml；标签相关配置位于 flows.update_metadata，封面图片和是否替换已有封面
+  位于 flows.apply_cover（flows.update_metadata.cover_image 存在时优先使用）。
+
+可选参数：
+  --config-file  配置文件路径，默认 config.yaml。
+  --input        临时覆盖输入目录。
+  --cover        临时覆盖封面图片路径。
+  --cover-max-pixels  封面最长边上限（像素），超出时缩放并压缩为 JPEG；0 表示保持原图。
+  --cover-max-kb      封面大小上限（KB），超出时逐步降低 JPEG 质量和尺寸；0 表示不限制。
+  --max-files    限制本次扫描文件数。
+  --write        实际写入文件；未提供时仅预览，不修改业务数据。
+  --workers      同时写入的文件数，0 表示使用全部 CPU 核；网络存储上可适当调大。
+  --full-rescan  忽略增量扫描索引，重新列出全部目录（需在配置中启用 app.scan_index）。
+
+示例：
+  python update_metadata_and_cover.py --cover assets/cover_images/sample.png --max-files 5
+  python update_metadata_and_cover.py --cover assets/cover_images/sample.png --write
+
+输出：
+  控制台输出 JSON 汇总，stats 中分别列出标签更新、标签未变化、封面写入和封面已相同的文件数；
+  --write 会原地更新音频标签和封面。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from mp3_processor.bootstrap import bootstrap_context
+from mp3_processor.cli import print_result
+from mp3_processor.flows.update_metadata_and_cover_flow import run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config-file", default="config.yaml")
+    parser.add_argument("--input")
+    parser.add_argument("--cover")
+    parser.add_argument("--cover-max-pixels", type=int)
+    parser.add_argument("--cover-max-kb", type=int)
+    parser.add_argument("--max-files", type=int)
+    parser.add_argument("--write", action="store_true")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--full-rescan", action="store_true")
+    args = parser.parse_args()
+    context = bootstrap_context(__file__, args.config_file)
+    return print_result(
+        run(
+            context,
+            input_path=args.input,
+            cover_image=args.cover,
+            cover_max_pixels=args.cover_max_pixels,
+            cover_max_kb=args.cover_max_kb,
+            write=args.write,
+            max_files=args.max_files,
+            full_rescan=args.full_rescan,
+            workers=args.workers,
+        )
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())